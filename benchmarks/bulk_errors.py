@@ -0,0 +1,69 @@
+"""
+Проверка поэлементных ошибок POST /api/v1/authors_books/bulk.
+
+Отправляет пачку, где часть записей не проходит валидаторы схемы, и
+сверяет, что по каждой сбойной записи вернулась её позиция и сообщение
+валидатора, а не общее "Неверный запрос". При расхождении скрипт
+завершается с кодом 1.
+
+    python -m benchmarks.bulk_errors
+"""
+
+import asyncio
+import sys
+from typing import List
+
+import httpx
+
+from src.application import get_app
+from src.core.db import async_session_maker, dispose_engine, init_engine
+
+from benchmarks.seed import PREFIX, cleanup
+
+PAYLOAD = [
+    {"name": f"{PREFIX}bulk-ok", "books": []},
+    {"name": None, "books": []},
+    {"name": f"{PREFIX}bulk-books", "books": "not-a-list"},
+]
+# позиция -> ожидаемое сообщение
+EXPECTED = {
+    1: "Имя не должно быть пустым",
+    2: "Поле books должно быть списком",
+}
+
+
+async def main() -> int:
+    errors: List[str] = []
+    try:
+        app = get_app()
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                response = await client.post("/api/v1/authors_books/bulk", json=PAYLOAD)
+        body = response.json()
+        created = [item["index"] for item in body.get("created", [])]
+        if created != [0]:
+            errors.append(f"создано {created}, ожидалось [0]")
+        reported = {item["index"]: item["message"] for item in body.get("errors", [])}
+        for index, message in EXPECTED.items():
+            status = "OK" if reported.get(index) == message else "FAIL"
+            print(f"{index:<4}{reported.get(index)!r:<40}{status}")
+            if status == "FAIL":
+                errors.append(
+                    f"{index}: {reported.get(index)!r}, ожидалось {message!r}"
+                )
+    finally:
+        init_engine()
+        async with async_session_maker() as session:
+            await cleanup(session)
+        await dispose_engine()
+
+    for error in errors:
+        print(error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
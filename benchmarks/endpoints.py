@@ -0,0 +1,189 @@
+"""
+Нагрузочный прогон всех роутеров внутри процесса.
+
+Засевает базу, поднимает приложение из get_app() и гоняет запросы через
+ASGI-транспорт httpx, без сети и без uvicorn. По каждому эндпоинту печатает
+p50/p95/p99 и пропускную способность и сравнивает их с сохранённым baseline.
+
+    python -m benchmarks.endpoints --requests 500 --concurrency 10
+    python -m benchmarks.endpoints --save-baseline   # записать текущие цифры
+
+Baseline зависит от машины, поэтому записывается локально и в репозиторий не
+коммитится. Если p95 эндпоинта хуже baseline больше чем на --tolerance,
+скрипт завершается с кодом 1.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from src.application import get_app
+from src.core.db import async_session_maker, dispose_engine, init_engine
+
+from benchmarks.seed import cleanup, seed_authors, seed_students, seed_users
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# эндпоинт -> функция, строящая путь по номеру запроса и id засеянных записей
+Endpoint = Tuple[str, Callable[[int, Dict[str, List]], str]]
+
+
+def endpoints(page: int) -> List[Endpoint]:
+    def by_id(prefix: str, key: str) -> Callable[[int, Dict[str, List]], str]:
+        return lambda i, ids: f"{prefix}{ids[key][i % len(ids[key])]}"
+
+    return [
+        ("authors list", lambda i, ids: f"/api/v1/authors_books/?limit={page}"),
+        ("authors by id", by_id("/api/v1/authors_books/", "authors")),
+        ("users list", lambda i, ids: f"/api/v1/users_profiles/?limit={page}"),
+        ("users by id", by_id("/api/v1/users_profiles/", "users")),
+        ("students list", lambda i, ids: f"/api/v1/students_courses/?limit={page}"),
+        ("students by id", by_id("/api/v1/students_courses/", "students")),
+        ("courses list", lambda i, ids: f"/api/v1/courses/?limit={page}"),
+    ]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    # метод ближайшего ранга
+    index = max(int(round(q / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[index]
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    build_path: Callable[[int, Dict[str, List]], str],
+    ids: Dict[str, List],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    timings: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await client.get(build_path(i, ids))
+            timings.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "rps": requests / elapsed,
+        "errors": errors,
+    }
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Dict[str, float]]]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def report(
+    results: Dict[str, Dict[str, float]],
+    baseline: Optional[Dict[str, Dict[str, float]]],
+    tolerance: float,
+) -> int:
+    regressions = 0
+    print(
+        f"{'endpoint':<16}{'first ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'rps':>9}{'errors':>8}  vs baseline p95"
+    )
+    for name, row in results.items():
+        line = (
+            f"{name:<16}{row['first_ms']:>10.2f}{row['p50_ms']:>9.2f}"
+            f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['rps']:>9.1f}"
+            f"{row['errors']:>8}"
+        )
+        base = (baseline or {}).get(name)
+        if base:
+            delta = row["p95_ms"] / base["p95_ms"] - 1
+            line += f"  {delta:+.1%}"
+            if delta > tolerance:
+                line += "  REGRESSION"
+                regressions += 1
+        print(line)
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    # движок для засева; lifespan приложения дальше берёт тот же и закрывает
+    init_engine()
+    async with async_session_maker() as session:
+        await cleanup(session)
+        ids = {
+            "authors": await seed_authors(session, args.authors, args.books),
+            "users": await seed_users(session, args.users),
+            "students": await seed_students(
+                session, args.students, args.courses, args.courses_per_student
+            ),
+        }
+
+    app = get_app()
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                for name, build_path in endpoints(args.page):
+                    # первый запрос отдельно: показывает, что остаётся от
+                    # холодного старта после прогрева в lifespan
+                    first = await run_endpoint(client, build_path, ids, 1, 1)
+                    await run_endpoint(client, build_path, ids, args.concurrency, 1)
+                    results[name] = await run_endpoint(
+                        client, build_path, ids, args.requests, args.concurrency
+                    )
+                    results[name]["first_ms"] = first["p50_ms"]
+    finally:
+        init_engine()
+        async with async_session_maker() as session:
+            await cleanup(session)
+        await dispose_engine()
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline записан в {args.baseline}")
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    regressions = report(results, baseline, args.tolerance)
+    if any(row["errors"] for row in results.values()):
+        print("есть ответы с ошибками, цифры недостоверны")
+        return 1
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--books", type=int, default=10, help="книг на автора")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--courses-per-student", type=int, default=3)
+    parser.add_argument("--page", type=int, default=100, help="limit для списков")
+    parser.add_argument("--requests", type=int, default=300, help="на эндпоинт")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="допустимый рост p95, доля"
+    )
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,141 @@
+"""
+Проверка согласованности total в списках с count=exact.
+
+Засевает базу, запрашивает первую страницу каждого списка со сжатием gzip,
+затем удаляет запись, которая на эту страницу не попадает: строки страницы
+не меняются, меняется только total. После exact_count_ttl total в теле должен
+совпасть с X-Total-Count, ETag должен смениться, а старый ETag в If-None-Match
+не должен давать 304. При любом расхождении скрипт завершается с кодом 1.
+
+    python -m benchmarks.list_totals --records 20 --page 10
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import delete
+
+from src.application import get_app
+from src.core.db import async_session_maker, dispose_engine, init_engine, settings
+from src.models.author import Author
+from src.models.courses import Course
+from src.models.student import Student
+from src.models.user import User
+
+from benchmarks.seed import PREFIX, cleanup, seed_authors, seed_students, seed_users
+
+LISTS = {
+    "authors": "/api/v1/authors_books/",
+    "students": "/api/v1/students_courses/",
+    "users": "/api/v1/users_profiles/",
+    "courses": "/api/v1/courses/",
+}
+HEADERS = {"Accept-Encoding": "gzip"}
+
+
+async def first_page(
+    client: httpx.AsyncClient,
+    path: str,
+    page: int,
+    if_none_match: Optional[str] = None,
+) -> Tuple[httpx.Response, Optional[int]]:
+    headers = dict(HEADERS)
+    if if_none_match:
+        headers["If-None-Match"] = if_none_match
+    response = await client.get(
+        path, params={"limit": page, "count": "exact"}, headers=headers
+    )
+    total = response.json()["total"] if response.status_code == 200 else None
+    return response, total
+
+
+def mismatches(label: str, response: httpx.Response, total: Optional[int]) -> List[str]:
+    header = response.headers.get("X-Total-Count")
+    if header != str(total):
+        return [f"{label}: total в теле {total}, X-Total-Count {header}"]
+    return []
+
+
+async def main(args: argparse.Namespace) -> int:
+    # движок для засева; lifespan приложения дальше берёт тот же и закрывает
+    init_engine()
+    async with async_session_maker() as session:
+        await cleanup(session)
+        ids = {
+            "authors": await seed_authors(session, args.records, 1),
+            "users": await seed_users(session, args.records),
+            "students": await seed_students(session, args.records, args.records, 1),
+        }
+
+    errors: List[str] = []
+    try:
+        app = get_app()
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                before: Dict[str, Tuple[httpx.Response, Optional[int]]] = {}
+                for name, path in LISTS.items():
+                    before[name] = await first_page(client, path, args.page)
+                    errors += mismatches(name, *before[name])
+
+                # последние засеянные записи: первые страницы их не содержат
+                async with async_session_maker() as session:
+                    await session.execute(
+                        delete(Author).where(Author.id == ids["authors"][-1])
+                    )
+                    await session.execute(
+                        delete(User).where(User.id == ids["users"][-1])
+                    )
+                    await session.execute(
+                        delete(Student).where(Student.id == ids["students"][-1])
+                    )
+                    await session.execute(
+                        delete(Course).where(
+                            Course.title == f"{PREFIX}course-{args.records - 1}"
+                        )
+                    )
+                    await session.commit()
+                await asyncio.sleep(settings.exact_count_ttl + 0.5)
+
+                for name, path in LISTS.items():
+                    old, old_total = before[name]
+                    failed = len(errors)
+                    response, total = await first_page(client, path, args.page)
+                    errors += mismatches(name, response, total)
+                    if total != old_total - 1:
+                        errors.append(
+                            f"{name}: total {total}, ожидался {old_total - 1}"
+                        )
+                    if response.headers.get("ETag") == old.headers.get("ETag"):
+                        errors.append(f"{name}: ETag не сменился вместе с total")
+                    revalidated, _ = await first_page(
+                        client, path, args.page, old.headers["ETag"]
+                    )
+                    if revalidated.status_code != 200:
+                        errors.append(
+                            f"{name}: старый ETag дал {revalidated.status_code}"
+                        )
+                    status = "OK" if len(errors) == failed else "FAIL"
+                    encoding = response.headers.get("Content-Encoding", "identity")
+                    print(f"{name:<12}{old_total} -> {total}  {encoding:<10}{status}")
+    finally:
+        init_engine()
+        async with async_session_maker() as session:
+            await cleanup(session)
+        await dispose_engine()
+
+    for error in errors:
+        print(error)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20)
+    parser.add_argument("--page", type=int, default=10)
+    sys.exit(asyncio.run(main(parser.parse_args())))
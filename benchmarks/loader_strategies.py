@@ -0,0 +1,66 @@
+"""
+Сравнение стратегий загрузки Author.books на авторах с большим числом книг.
+
+    python -m benchmarks.loader_strategies --authors 200 --books 50 --page 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.core.db import async_session_maker, dispose_engine, init_engine
+from src.core.enums import LoaderStrategy
+from src.repositories.author import AuthorRepository
+
+from benchmarks.seed import cleanup, seed_authors
+
+
+async def measure(strategy: LoaderStrategy, page: int, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        async with async_session_maker() as session:
+            start = time.perf_counter()
+            authors, _ = await AuthorRepository(session).get_all(page, None, strategy)
+            books = sum(len(a.books) for a in authors)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "strategy": strategy.value,
+        "authors": len(authors),
+        "books": books,
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_engine()
+    async with async_session_maker() as session:
+        await cleanup(session)
+        await seed_authors(session, args.authors, args.books)
+    try:
+        print(
+            f"{'strategy':<10}{'authors':>9}{'books':>8}{'mean ms':>10}{'p95 ms':>10}"
+        )
+        for strategy in LoaderStrategy:
+            # прогрев: компиляция запроса и кэш подготовленных выражений
+            await measure(strategy, args.page, 2)
+            row = await measure(strategy, args.page, args.repeat)
+            print(
+                f"{row['strategy']:<10}{row['authors']:>9}{row['books']:>8}"
+                f"{row['mean_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+            )
+    finally:
+        async with async_session_maker() as session:
+            await cleanup(session)
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--books", type=int, default=50, help="книг на автора")
+    parser.add_argument("--page", type=int, default=100, help="размер страницы")
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
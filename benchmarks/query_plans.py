@@ -0,0 +1,225 @@
+"""
+Регрессионная проверка планов: EXPLAIN для горячих запросов репозиториев.
+
+Засевает базу, выполняет запросы репозиториев, перехватывает их SQL и
+повторяет каждый SELECT через EXPLAIN с enable_seqscan=off. Планировщик
+выбирает Seq Scan в таком режиме только при отсутствии подходящего индекса,
+поэтому любой Seq Scan в плане означает пропавший индекс. Если такой нашёлся,
+скрипт завершается с кодом 1.
+
+    python -m benchmarks.query_plans --authors 2000 --students 2000 --users 2000
+"""
+
+import argparse
+import asyncio
+import sys
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import async_session_maker, dispose_engine, get_engine, init_engine
+from src.core.enums import LoaderStrategy
+from src.core.filters import Condition, ListParams
+from src.repositories.author import AuthorRepository
+from src.repositories.course import CourseRepository
+from src.repositories.students import StudentRepository
+from src.repositories.user import UserRepository
+from src.schemas.courses import SCourseCreate
+
+from benchmarks.seed import PREFIX, cleanup, seed_authors, seed_students, seed_users
+
+Probe = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Any]]
+
+
+@contextmanager
+def capture_selects() -> Iterator[List[Tuple[str, Any]]]:
+    statements: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if not many and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = get_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def _second_page(repository, **kwargs) -> Any:
+    _, cursor = await repository.get_all(10, None, **kwargs)
+    return await repository.get_all(10, cursor, **kwargs)
+
+
+def probes() -> List[Tuple[str, Probe]]:
+    result: List[Tuple[str, Probe]] = []
+    for strategy in (LoaderStrategy.JOINED, LoaderStrategy.SELECTIN):
+        result += [
+            (
+                f"author.get_id[{strategy.value}]",
+                lambda s, ids, st=strategy: AuthorRepository(s).get_id(
+                    st, id=ids["author"]
+                ),
+            ),
+            (
+                f"author.get_all[{strategy.value}]",
+                lambda s, ids, st=strategy: _second_page(
+                    AuthorRepository(s), strategy=st
+                ),
+            ),
+            (
+                f"student.get_id[{strategy.value}]",
+                lambda s, ids, st=strategy: StudentRepository(s).get_id(
+                    ids["student"], st
+                ),
+            ),
+            (
+                f"student.get_all[{strategy.value}]",
+                lambda s, ids, st=strategy: _second_page(
+                    StudentRepository(s), strategy=st
+                ),
+            ),
+            (
+                f"user.get_id[{strategy.value}]",
+                lambda s, ids, st=strategy: UserRepository(s).get_id(
+                    st, id=ids["user"]
+                ),
+            ),
+            (
+                f"user.get_all[{strategy.value}]",
+                lambda s, ids, st=strategy: _second_page(
+                    UserRepository(s), strategy=st
+                ),
+            ),
+        ]
+    for name, repository in (
+        ("author", AuthorRepository),
+        ("student", StudentRepository),
+        ("user", UserRepository),
+    ):
+        result += [
+            (
+                f"{name}.get_version",
+                lambda s, ids, r=repository, n=name: r(s).get_version(ids[n]),
+            ),
+            (
+                f"{name}.get_page_versions",
+                lambda s, ids, r=repository: r(s).get_page_versions(10),
+            ),
+        ]
+    # фильтры и сортировки, которые должны идти по индексам
+    by_name = ListParams(sort="-name")
+    result += [
+        (
+            "author.get_all[sort=-name]",
+            lambda s, ids: _second_page(AuthorRepository(s), params=by_name),
+        ),
+        (
+            "student.get_all[sort=-name]",
+            lambda s, ids: _second_page(StudentRepository(s), params=by_name),
+        ),
+        (
+            "student.get_all[course]",
+            lambda s, ids: _second_page(
+                StudentRepository(s),
+                params=ListParams((Condition("course", "eq", f"{PREFIX}course-1"),)),
+            ),
+        ),
+        (
+            "user.get_all[created_at]",
+            lambda s, ids: _second_page(
+                UserRepository(s),
+                params=ListParams(
+                    (Condition("created_at", "gte", "2000-01-01T00:00:00"),)
+                ),
+            ),
+        ),
+    ]
+    result += [
+        (
+            "author.search",
+            lambda s, ids: AuthorRepository(s).search(f"{PREFIX}book-7-1", 10),
+        ),
+        ("course.get_all", lambda s, ids: _second_page(CourseRepository(s))),
+        (
+            "course.get_page_versions",
+            lambda s, ids: CourseRepository(s).get_page_versions(10),
+        ),
+        (
+            "course.find",
+            lambda s, ids: CourseRepository(s).find([f"{PREFIX}course-1"]),
+        ),
+        (
+            "course.update",
+            lambda s, ids: CourseRepository(s).update(
+                [SCourseCreate(title=f"{PREFIX}course-2")]
+            ),
+        ),
+    ]
+    return result
+
+
+def seq_scans(plan: Dict[str, Any]) -> List[str]:
+    found = []
+    if plan["Node Type"] == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found += seq_scans(child)
+    return found
+
+
+async def explain(statement: str, parameters: Any) -> Dict[str, Any]:
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        raw = (await conn.get_raw_connection()).driver_connection
+        # json-кодек asyncpg регистрирует диалект SQLAlchemy, ответ уже разобран
+        plan = await raw.fetchval(
+            f"EXPLAIN (FORMAT JSON) {statement}", *(parameters or ())
+        )
+        await conn.rollback()
+    return plan[0]["Plan"]
+
+
+async def main(args: argparse.Namespace) -> int:
+    init_engine()
+    async with async_session_maker() as session:
+        await cleanup(session)
+        ids = {
+            "author": (await seed_authors(session, args.authors, 5))[0],
+            "student": (await seed_students(session, args.students, 50, 3))[0],
+            "user": (await seed_users(session, args.users))[0],
+        }
+        await session.execute(text("ANALYZE"))
+
+    failures = 0
+    try:
+        for label, probe in probes():
+            with capture_selects() as statements:
+                async with async_session_maker() as session:
+                    await probe(session, ids)
+                    await session.rollback()
+            for statement, parameters in statements:
+                tables = seq_scans(await explain(statement, parameters))
+                status = "OK" if not tables else "SEQ SCAN: " + ", ".join(tables)
+                print(f"{label:<28}{status}")
+                if tables:
+                    failures += 1
+                    if args.verbose:
+                        print(statement)
+    finally:
+        async with async_session_maker() as session:
+            await cleanup(session)
+        await dispose_engine()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=2000)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--verbose", action="store_true", help="печатать SQL")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,120 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.author import Author
+from src.models.books import Book
+from src.models.courses import Course
+from src.models.profile import Profile
+from src.models.student import Student, student_course
+from src.models.user import User
+
+# все записи бенчмарков помечены префиксом, чтобы их можно было убрать за собой
+PREFIX = "bench-"
+# и датированы прошлым, чтобы первые страницы списков состояли из них
+EPOCH = datetime(2000, 1, 1)
+CHUNK = 1000
+
+
+async def _insert_chunked(session: AsyncSession, table, rows: List[dict]) -> None:
+    for start in range(0, len(rows), CHUNK):
+        await session.execute(insert(table), rows[start : start + CHUNK])
+
+
+async def seed_authors(
+    session: AsyncSession, authors: int, books_per_author: int
+) -> List[uuid.UUID]:
+    author_rows, book_rows = [], []
+    for i in range(authors):
+        author_id = uuid.uuid4()
+        created = EPOCH + timedelta(microseconds=i)
+        author_rows.append(
+            {"id": author_id, "name": f"{PREFIX}author-{i}", "created_at": created}
+        )
+        for j in range(books_per_author):
+            book_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "title": f"{PREFIX}book-{i}-{j}",
+                    "created_at": created,
+                    "author_id": author_id,
+                }
+            )
+    await _insert_chunked(session, Author.__table__, author_rows)
+    await _insert_chunked(session, Book.__table__, book_rows)
+    await session.commit()
+    return [row["id"] for row in author_rows]
+
+
+async def seed_students(
+    session: AsyncSession, students: int, courses: int, courses_per_student: int
+) -> List[uuid.UUID]:
+    course_rows = [
+        {
+            "id": uuid.uuid4(),
+            "title": f"{PREFIX}course-{i}",
+            "created_at": EPOCH + timedelta(microseconds=i),
+        }
+        for i in range(courses)
+    ]
+    student_rows, enrollment_rows = [], []
+    for i in range(students):
+        student_id = uuid.uuid4()
+        student_rows.append(
+            {
+                "id": student_id,
+                "name": f"{PREFIX}student-{i}",
+                "created_at": EPOCH + timedelta(microseconds=i),
+            }
+        )
+        for j in range(courses_per_student):
+            course = course_rows[(i + j) % courses]
+            enrollment_rows.append(
+                {"student_id": student_id, "course_id": course["id"]}
+            )
+    await _insert_chunked(session, Course.__table__, course_rows)
+    await _insert_chunked(session, Student.__table__, student_rows)
+    await _insert_chunked(session, student_course, enrollment_rows)
+    await session.commit()
+    return [row["id"] for row in student_rows]
+
+
+async def seed_users(session: AsyncSession, users: int) -> List[uuid.UUID]:
+    user_rows, profile_rows = [], []
+    for i in range(users):
+        user_id = uuid.uuid4()
+        created = EPOCH + timedelta(microseconds=i)
+        user_rows.append(
+            {
+                "id": user_id,
+                "username": f"{PREFIX}user-{i}",
+                "email": f"{PREFIX}user-{i}@example.com",
+                "created_at": created,
+            }
+        )
+        profile_rows.append(
+            {
+                "id": uuid.uuid4(),
+                "first_name": f"{PREFIX}first-{i}",
+                "last_name": f"last-{i}",
+                "phone_number": f"{PREFIX}{i:010d}",
+                "created_at": created,
+                "user_id": user_id,
+            }
+        )
+    await _insert_chunked(session, User.__table__, user_rows)
+    await _insert_chunked(session, Profile.__table__, profile_rows)
+    await session.commit()
+    return [row["id"] for row in user_rows]
+
+
+async def cleanup(session: AsyncSession) -> None:
+    # книги, записи на курсы и профили удалит ON DELETE CASCADE
+    await session.execute(delete(Author).where(Author.name.startswith(PREFIX)))
+    await session.execute(delete(Student).where(Student.name.startswith(PREFIX)))
+    await session.execute(delete(Course).where(Course.title.startswith(PREFIX)))
+    await session.execute(delete(User).where(User.username.startswith(PREFIX)))
+    await session.commit()
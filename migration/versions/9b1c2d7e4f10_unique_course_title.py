@@ -0,0 +1,49 @@
+"""unique course title
+
+Revision ID: 9b1c2d7e4f10
+Revises: 4e60130f1029
+Create Date: 2026-10-18 19:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9b1c2d7e4f10"
+down_revision: Union[str, Sequence[str], None] = "4e60130f1029"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # дубли, успевшие появиться без ограничения: записи на курс переносим
+    # на самый ранний курс с тем же названием, остальные удаляем
+    op.execute("""
+        CREATE TEMPORARY TABLE course_dups ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id,
+                   first_value(id) OVER (
+                       PARTITION BY title ORDER BY created_at, id
+                   ) AS keep_id
+            FROM courses
+        ) AS ranked
+        WHERE id <> keep_id
+        """)
+    op.execute("""
+        INSERT INTO student_course (student_id, course_id)
+        SELECT sc.student_id, d.keep_id
+        FROM student_course AS sc
+        JOIN course_dups AS d ON d.id = sc.course_id
+        ON CONFLICT DO NOTHING
+        """)
+    op.execute("DELETE FROM courses WHERE id IN (SELECT id FROM course_dups)")
+    op.create_unique_constraint("courses_title_key", "courses", ["title"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("courses_title_key", "courses", type_="unique")
@@ -0,0 +1,51 @@
+"""secondary indexes
+
+Revision ID: c4a8e2f61d37
+Revises: 9b1c2d7e4f10
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8e2f61d37"
+down_revision: Union[str, Sequence[str], None] = "9b1c2d7e4f10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# courses.title уже покрыт уникальным индексом courses_title_key
+INDEXES = [
+    # загрузка книг автора и ON DELETE CASCADE при удалении автора
+    ("ix_books_author_id", "books", ["author_id"]),
+    # PK (student_id, course_id) не помогает искать по course_id: студенты курса
+    # и ON DELETE CASCADE при удалении курса
+    ("ix_student_course_course_id", "student_course", ["course_id"]),
+    # keyset-пагинация и экспорт идут по (created_at, id)
+    ("ix_authors_created_at_id", "authors", ["created_at", "id"]),
+    ("ix_students_created_at_id", "students", ["created_at", "id"]),
+    ("ix_users_created_at_id", "users", ["created_at", "id"]),
+    ("ix_courses_created_at_id", "courses", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри
+    # транзакции. Если сборка упала, остаётся INVALID-индекс, и его нужно
+    # удалить перед повторным запуском.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
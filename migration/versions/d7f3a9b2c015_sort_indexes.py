@@ -0,0 +1,41 @@
+"""sort indexes
+
+Revision ID: d7f3a9b2c015
+Revises: c4a8e2f61d37
+Create Date: 2026-10-18 23:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7f3a9b2c015"
+down_revision: Union[str, Sequence[str], None] = "c4a8e2f61d37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# keyset-пагинация при ?sort=name идёт по (name, id); users.username,
+# users.email и courses.title уже покрыты уникальными индексами
+INDEXES = [
+    ("ix_authors_name_id", "authors", ["name", "id"]),
+    ("ix_students_name_id", "students", ["name", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
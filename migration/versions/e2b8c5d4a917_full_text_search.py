@@ -0,0 +1,63 @@
+"""full text search
+
+Revision ID: e2b8c5d4a917
+Revises: d7f3a9b2c015
+Create Date: 2026-10-18 23:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b8c5d4a917"
+down_revision: Union[str, Sequence[str], None] = "d7f3a9b2c015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# таблица, исходная колонка, вес в ранжировании, имя GIN-индекса
+VECTORS = [
+    ("authors", "name", "A", "ix_authors_search_vector"),
+    ("books", "title", "B", "ix_books_search_vector"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # STORED-колонку Postgres пересчитывает сам при каждой записи source;
+    # ADD COLUMN переписывает таблицу под ACCESS EXCLUSIVE
+    for table, source, weight, _ in VECTORS:
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                TSVECTOR(),
+                sa.Computed(
+                    f"setweight(to_tsvector('simple', coalesce({source}, '')), '{weight}')",
+                    persisted=True,
+                ),
+            ),
+        )
+    with op.get_context().autocommit_block():
+        for table, _, _, index in VECTORS:
+            op.create_index(
+                index,
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, _, _, index in reversed(VECTORS):
+            op.drop_index(index, table_name=table, postgresql_concurrently=True)
+    for table, _, _, _ in reversed(VECTORS):
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,51 @@
+"""trigram indexes
+
+Revision ID: f4a6d1e8b352
+Revises: e2b8c5d4a917
+Create Date: 2026-10-19 00:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f4a6d1e8b352"
+down_revision: Union[str, Sequence[str], None] = "e2b8c5d4a917"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# нечёткий поиск пользователей: /users_profiles/search
+INDEXES = [
+    ("ix_users_username_trgm", "users", "username"),
+    ("ix_users_email_trgm", "users", "email"),
+    ("ix_profiles_first_name_trgm", "profiles", "first_name"),
+    ("ix_profiles_last_name_trgm", "profiles", "last_name"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm входит в contrib; CREATE EXTENSION требует прав владельца базы
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # расширение не удаляем: им могут пользоваться не только эти индексы
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -1,15 +1,24 @@
 import logging
 from fastapi import FastAPI, Request
 from starlette.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
+from src.core.compression import CompressedCache, build_codecs
 from src.core.config_logging import setup_logging
+from src.core.db import settings
+from src.core.lifespan import lifespan
+from src.core.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+    ServerTimingMiddleware,
+)
+from src.core.responses import ModelResponse
 from src.exception.exception_handlers import setup_exception_handlers
 from src.routers.v1.user import router as user_router
 from src.routers.v1.author import router as author_router
 from src.routers.v1.student import router as student_router
 from src.routers.v1.courses import router as courses_router
-
+from src.routers.v1.monitoring import metrics_router, router as monitoring_router
 
 setup_logging()
 
@@ -27,7 +36,8 @@ def get_app() -> FastAPI:
     app = FastAPI(
         docs_url="/docs",
         openapi_url="/openapi.json",
-        default_response_class=JSONResponse,
+        default_response_class=ModelResponse,
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -37,12 +47,46 @@ def get_app() -> FastAPI:
         allow_origin_regex=r"http://localhost:.*",  # Для локальной разработки
         allow_methods=["*"],
         allow_headers=["*"],
+        # общее число записей для пагинации в UI (?count=)
+        expose_headers=["X-Total-Count"],
     )
+    if settings.postgres_replica_urls:
+        app.add_middleware(
+            ReadYourWritesMiddleware, window=settings.read_your_writes_seconds
+        )
+    if settings.sql_timing_enabled:
+        app.add_middleware(
+            ServerTimingMiddleware,
+            n_plus_one_threshold=settings.n_plus_one_threshold,
+        )
+    if settings.compression_enabled:
+        # снаружи Server-Timing (заголовок уже выставлен), внутри метрик
+        # (размер ответа считается сжатым)
+        app.add_middleware(
+            CompressionMiddleware,
+            codecs=build_codecs(
+                settings.compression_gzip_level,
+                settings.compression_brotli_quality,
+                settings.compression_zstd_level,
+            ),
+            minimum_size=settings.compression_minimum_size,
+            cache=(
+                CompressedCache(settings.compression_cache_entries)
+                if settings.compression_cache_entries
+                else None
+            ),
+        )
+    if settings.metrics_enabled:
+        # добавлен последним, значит внешний: меряет и CORS, и обработчики ошибок
+        app.add_middleware(MetricsMiddleware)
     logger.info("Запуск приложения")
     app.include_router(user_router)
     app.include_router(author_router)
     app.include_router(student_router)
     app.include_router(courses_router)
+    app.include_router(monitoring_router)
+    if settings.metrics_enabled:
+        app.include_router(metrics_router)
     setup_exception_handlers(app)
 
     return app
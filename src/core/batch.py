@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Type,
+)
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import EntityCache
+from src.core.db import settings
+from src.core.etag import version_of
+from src.exception.client_exception import BadRequestError
+
+
+def any_id(column: Any, ids: Sequence[uuid.UUID]) -> sa.ColumnElement:
+    """
+    column = ANY($1::UUID[]): один параметр-массив вместо IN ($1, ..., $N),
+    текст запроса и подготовленное выражение не зависят от числа id.
+    """
+    return column == sa.any_(sa.literal(list(ids), ARRAY(column.type)))
+
+
+async def load_many(
+    session: AsyncSession,
+    ids: Sequence[uuid.UUID],
+    cache: EntityCache,
+    schema: Type[BaseModel],
+    fields: Optional[FrozenSet[str]],
+    fetch: Callable[[List[uuid.UUID]], Awaitable[Sequence[Any]]],
+) -> Dict[uuid.UUID, BaseModel]:
+    """
+    Схемы чтения по списку id: сначала кэш, остальное одним запросом fetch.
+
+    Возвращает только найденные; порядок и пропуски собирает вызывающий.
+    В кэш, как и при чтении по одному id, кладутся только полные записи.
+    """
+    unique = list(dict.fromkeys(ids))
+    if len(unique) > settings.batch_get_max_ids:
+        raise BadRequestError(
+            detail="Слишком много id в одном запросе",
+            ids=len(unique),
+            max_ids=settings.batch_get_max_ids,
+        )
+    cached = await asyncio.gather(*(cache.get(id) for id in unique))
+    found = {
+        id: schema.model_validate(value, from_attributes=True)
+        for id, value in zip(unique, cached)
+        if value is not None
+    }
+    missing = [id for id in unique if id not in found]
+    if missing:
+        for row in await fetch(missing):
+            found[row.id] = schema.model_validate(row, from_attributes=True)
+            if fields is None:
+                await cache.set(session, row.id, found[row.id], version_of(row))
+    return found
@@ -0,0 +1,229 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Generic, Optional, Protocol, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import on_commit, reads_replica, settings
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CacheBackend(ABC):
+    """Хранилище сериализованных значений по строковому ключу."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class MemoryCache(CacheBackend):
+    """LRU с TTL внутри процесса, у каждого воркера свой."""
+
+    def __init__(self, max_entries: int) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def size(self) -> Optional[int]:
+        return len(self._data)
+
+
+class ExternalCacheClient(Protocol):
+    """Подмножество API redis.asyncio.Redis, которое нужно кэшу."""
+
+    async def get(self, name: str) -> Optional[bytes]: ...
+
+    async def set(self, name: str, value: bytes, ex: Optional[int] = None) -> Any: ...
+
+    async def delete(self, *names: str) -> Any: ...
+
+
+class ExternalCache(CacheBackend):
+    """Общий для всех воркеров кэш во внешнем хранилище (Redis и т.п.)."""
+
+    def __init__(self, client: ExternalCacheClient, prefix: str = "fastapi:") -> None:
+        super().__init__()
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(self.prefix + key, value, ex=max(int(ttl), 1))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+
+class StubCacheClient:
+    """Локальная заглушка внешнего хранилища для разработки и тестов."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+
+    async def get(self, name: str) -> Optional[bytes]:
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[name]
+            return None
+        return value
+
+    async def set(self, name: str, value: bytes, ex: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[name] = (expires_at, value)
+        return True
+
+    async def delete(self, *names: str) -> int:
+        return sum(self._data.pop(name, None) is not None for name in names)
+
+
+class NullCache(CacheBackend):
+    """Кэш выключен: всегда промах."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        return None
+
+    async def delete(self, *keys: str) -> None:
+        return None
+
+
+def build_cache_backend(kind: str, max_entries: int) -> CacheBackend:
+    if kind == "memory":
+        return MemoryCache(max_entries)
+    if kind == "stub":
+        return ExternalCache(StubCacheClient())
+    if kind == "none":
+        return NullCache()
+    raise ValueError(f"Неизвестный бэкенд кэша: {kind}")
+
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+class EntityCache(Generic[SchemaT]):
+    """Read-through кэш схем чтения одной сущности по id."""
+
+    def __init__(
+        self, backend: CacheBackend, namespace: str, schema: Type[SchemaT], ttl: float
+    ) -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.schema = schema
+        self.ttl = ttl
+
+    def key(self, id: Any) -> str:
+        return f"{self.namespace}:{id}"
+
+    async def get(
+        self, id: Any, version: Optional[datetime] = None
+    ) -> Optional[SchemaT]:
+        """
+        Запись из кэша; с version - только этой версии строки, иначе промах.
+
+        Роут по id строит ETag по версии из базы: тело под ним должно быть
+        той же версии, а не той, что успела лечь в кэш.
+        """
+        raw = await self.backend.get(self.key(id))
+        if raw is None:
+            return None
+        stored, _, data = raw.partition(b"\n")
+        if version is not None and stored != version.isoformat().encode():
+            return None
+        return self.schema.model_validate_json(data)
+
+    async def set(
+        self, session: AsyncSession, id: Any, value: SchemaT, version: datetime
+    ) -> None:
+        # реплика может ещё не догнать коммит, после которого invalidate
+        # сбросил ключ: её старая версия жила бы в кэше весь ttl
+        if reads_replica(session):
+            return
+        # версия строки первой строкой, дальше JSON схемы (в нём нет \n)
+        await self.backend.set(
+            self.key(id),
+            version.isoformat().encode() + b"\n" + value.model_dump_json().encode(),
+            self.ttl,
+        )
+
+    async def invalidate(self, session: AsyncSession, id: Any) -> None:
+        # удаляем сразу и ещё раз после коммита: иначе чтение, попавшее
+        # между удалением и коммитом, вернёт в кэш старую версию
+        key = self.key(id)
+        await self.backend.delete(key)
+        on_commit(session, lambda: self.backend.delete(key))
+
+
+cache_backend = build_cache_backend(settings.cache_backend, settings.cache_max_entries)
+
+
+def entity_cache(namespace: str, schema: Type[SchemaT]) -> EntityCache[SchemaT]:
+    return EntityCache(cache_backend, namespace, schema, settings.cache_ttl)
@@ -0,0 +1,166 @@
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Protocol
+
+try:
+    import brotli
+except ImportError:  # необязательная зависимость, extra "compression"
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # необязательная зависимость, extra "compression"
+    zstandard = None
+
+
+class CompressStream(Protocol):
+    def chunk(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class Codec(Protocol):
+    """Алгоритм сжатия: целиком для готового тела и потоком для стриминга."""
+
+    name: str
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def stream(self) -> CompressStream: ...
+
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level: int) -> None:
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level, wbits=31)
+
+    def stream(self) -> "GzipStream":
+        return GzipStream(self.level)
+
+
+class GzipStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        # SYNC_FLUSH: клиент может разжать всё, что уже пришло
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCodec:
+    name = "br"
+
+    def __init__(self, quality: int) -> None:
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> "BrotliStream":
+        return BrotliStream(self.quality)
+
+
+class BrotliStream:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def stream(self) -> "ZstdStream":
+        return ZstdStream(self._compressor)
+
+
+class ZstdStream:
+    def __init__(self, compressor: "zstandard.ZstdCompressor") -> None:
+        self._compressor = compressor.compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def build_codecs(
+    gzip_level: int, brotli_quality: int, zstd_level: int
+) -> Dict[str, Codec]:
+    """Доступные кодеки в порядке предпочтения сервера."""
+    codecs: Dict[str, Codec] = {}
+    if zstandard is not None:
+        codecs["zstd"] = ZstdCodec(zstd_level)
+    if brotli is not None:
+        codecs["br"] = BrotliCodec(brotli_quality)
+    codecs["gzip"] = GzipCodec(gzip_level)
+    return codecs
+
+
+def negotiate(accept_encoding: str, codecs: Dict[str, Codec]) -> Optional[Codec]:
+    """
+    Выбирает кодек по Accept-Encoding: наибольший q, при равных - порядок
+    предпочтения сервера; q=0 запрещает кодировку.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name, codec in codecs.items():
+        q = weights.get(name, wildcard)
+        if q > best_q:
+            best, best_q = codec, q
+    return best
+
+
+class CompressedCache:
+    """LRU сжатых тел ответов внутри процесса."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, bytes]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
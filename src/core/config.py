@@ -1,4 +1,5 @@
 import os
+from typing import List
 
 from pydantic import PostgresDsn, Field
 from pydantic_settings import BaseSettings
@@ -6,8 +7,86 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     postgres_url: PostgresDsn = Field(env="postgres_url")
+    # реплики для чтения, JSON-список; GET-роуты ходят в них по кругу
+    postgres_replica_urls: List[PostgresDsn] = []
+    # сколько секунд после записи клиент читает с primary (отставание реплик)
+    read_your_writes_seconds: int = 5
+
+    # пул соединений, значения на один воркер
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # кэши подготовленных выражений asyncpg (0 - выключить, нужно для pgbouncer)
+    db_statement_cache_size: int = 100
+    db_prepared_statement_cache_size: int = 100
+
+    # авторов в одном многострочном INSERT при массовой загрузке
+    bulk_chunk_size: int = 1000
+
+    # прогрев при старте: соединения пула, мапперы, компиляция горячих запросов
+    warmup_enabled: bool = True
+    # сколько соединений открыть заранее (0 - db_pool_size)
+    warmup_connections: int = 0
+
+    # кэш чтения по id: memory | stub | none
+    cache_backend: str = "memory"
+    cache_max_entries: int = 10_000
+    cache_ttl: float = 60.0
+
+    # ?count=exact у списков: точный COUNT(*) дорог на больших таблицах,
+    # поэтому его можно выключить, а результат кэшируется на exact_count_ttl
+    exact_count_enabled: bool = True
+    exact_count_ttl: float = 10.0
+    # у подсчётов свой кэш в памяти: не вытесняют записи кэша чтения по id
+    exact_count_cache_entries: int = 1000
+
+    # id в одном POST /batch-get
+    batch_get_max_ids: int = 100
+
+    # строк на одну выборку серверного курсора при NDJSON-выгрузке
+    export_chunk_size: int = 500
+
+    # метрики Prometheus на /metrics; при нескольких воркерах нужна переменная
+    # PROMETHEUS_MULTIPROC_DIR, её читает сам prometheus_client
+    metrics_enabled: bool = True
+
+    # счётчик и время SQL в заголовке Server-Timing
+    sql_timing_enabled: bool = True
+    # одинаковых запросов за один HTTP-запрос, после которых пишем про N+1
+    n_plus_one_threshold: int = 10
+
+    # сжатие ответов: gzip всегда, zstd и br - если стоит extra "compression"
+    compression_enabled: bool = True
+    # тела меньше этого размера уходят несжатыми
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+    # сжатых ответов с ETag в LRU-кэше воркера (0 - без кэша)
+    compression_cache_entries: int = 256
+
+    # логи в JSON (одна запись - одна строка) вместо текста
+    log_json: bool = False
+    # записей в секунду от одного логгера, остальные отбрасываются (0 - без лимита)
+    log_rate_limit: int = 100
+
+    # запуск через src.main; server_workers=0 - по числу CPU
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0
+    server_backlog: int = 2048
+    server_keepalive: int = 5
+    # сколько ждать завершения текущих запросов после SIGTERM
+    server_graceful_timeout: int = 30
+    # импортировать приложение в мастере до fork, воркеры делят страницы кода
+    server_preload: bool = True
 
     class Config:
         env_file = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))), ".env"
         )
+
+
+settings = Settings()
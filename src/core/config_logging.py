@@ -1,4 +1,14 @@
+import atexit
+import copy
 import logging.config
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
+
+import orjson
+
+from src.core.config import settings
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -39,6 +49,124 @@ LOGGING_CONFIG = {
     },
 }
 
+# атрибуты, которые есть у любой записи; всё остальное пришло через extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - один JSON-объект, поля из extra= попадают на верхний уровень."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return orjson.dumps(payload, default=str).decode()
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Не больше limit записей в секунду от одного логгера.
+
+    Лишние записи отбрасываются ещё до очереди, о количестве пропущенных
+    сообщает первая запись следующего окна. ERROR и выше не ограничиваются.
+    """
+
+    def __init__(self, limit: int) -> None:
+        super().__init__()
+        self.limit = limit
+        # логгер -> [начало окна, записей в окне, пропущено]
+        self._windows: Dict[str, List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        now = time.monotonic()
+        window = self._windows.get(record.name)
+        if window is None or now - window[0] >= 1.0:
+            suppressed = int(window[2]) if window else 0
+            self._windows[record.name] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.getMessage()} [пропущено записей: {suppressed}]"
+                record.args = None
+            return True
+        if window[1] < self.limit:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+_TRACEBACK = logging.Formatter()
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # как в QueueHandler, но traceback остаётся в exc_text, а не в тексте
+        # сообщения, чтобы JSON-формат отдал его отдельным полем
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _TRACEBACK.formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener() -> None:
+    # stop() дописывает всё, что осталось в очереди
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logging():
+    """
+    Настраивает логирование через очередь.
+
+    Обработчики из LOGGING_CONFIG (консоль, файл с ротацией) работают в
+    отдельном потоке QueueListener; логгеры кладут запись в очередь и сразу
+    возвращаются, поэтому запись на диск не блокирует event loop. Повторный
+    вызов (например, в воркере после fork) перезапускает поток.
+    """
+    _stop_listener()
     logging.config.dictConfig(LOGGING_CONFIG)
+
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    if settings.log_json:
+        json_formatter = JsonFormatter()
+        for handler in handlers:
+            handler.setFormatter(json_formatter)
+
+    queue_handler = _QueueHandler(queue.SimpleQueue())
+    if settings.log_rate_limit:
+        queue_handler.addFilter(RateLimitFilter(settings.log_rate_limit))
+    root.handlers = [queue_handler]
+    logging.getLogger("services").handlers = [queue_handler]
+
+    global _listener
+    _listener = QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
@@ -1,10 +1,31 @@
+import itertools
+import re
+import time
+from collections import Counter
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import sqlalchemy as sa
-from typing import Annotated, List, AsyncGenerator
-from sqlalchemy import Text, String, ARRAY
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import (
+    Annotated,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+)
+from sqlalchemy import Text, String, ARRAY, event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import (
     DeclarativeMeta,
+    Session,
     declarative_base,
     class_mapper,
     mapped_column,
@@ -12,14 +33,169 @@ from sqlalchemy.orm import (
 from sqlalchemy.ext.asyncio import AsyncAttrs
 
 
-from src.core.config import Settings
+from src.core.config import settings
+from src.core.pool import InstrumentedQueuePool
 
+# движок создаётся в lifespan приложения (src.core.lifespan), а не при импорте:
+# при --preload мастер импортирует код, но соединений не открывает
+_engine: Optional[AsyncEngine] = None
+_session_maker: Optional[async_sessionmaker] = None
+_read_session_maker: Optional[async_sessionmaker] = None
+_replica_engines: List[AsyncEngine] = []
+_replica_cycle: Optional[Iterator[async_sessionmaker]] = None
+
+# выставляется ReadYourWritesMiddleware: клиент только что писал, и реплика
+# может ещё не догнать primary
+read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+# ключ в ASGI scope: запрос только читает, даже если пришёл POST-ом
+READ_ONLY_SCOPE_KEY = "read_only"
+
+
+def create_engine(url: Optional[str] = None) -> AsyncEngine:
+    return create_async_engine(
+        url or str(settings.postgres_url),
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        },
+    )
+
+
+def _read_only_maker(engine: AsyncEngine, replica: bool = False) -> async_sessionmaker:
+    # тот же пул, но без BEGIN/COMMIT: каждый SELECT идёт сам по себе
+    return async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+        info={"read_only": True, "replica": replica},
+    )
+
+
+def init_engine() -> AsyncEngine:
+    global _engine, _session_maker, _read_session_maker, _replica_engines
+    global _replica_cycle
+    if _engine is None:
+        _engine = create_engine()
+        _session_maker = async_sessionmaker(
+            _engine, class_=AsyncSession, expire_on_commit=False
+        )
+        _read_session_maker = _read_only_maker(_engine)
+        _replica_engines = [
+            create_engine(str(url)) for url in settings.postgres_replica_urls
+        ]
+        if _replica_engines:
+            _replica_cycle = itertools.cycle(
+                [_read_only_maker(engine, replica=True) for engine in _replica_engines]
+            )
+    return _engine
+
+
+async def dispose_engine() -> None:
+    global _engine, _session_maker, _read_session_maker, _replica_engines
+    global _replica_cycle
+    for engine in [_engine, *_replica_engines]:
+        if engine is not None:
+            await engine.dispose()
+    _engine = _session_maker = _read_session_maker = _replica_cycle = None
+    _replica_engines = []
+
+
+def get_engine() -> AsyncEngine:
+    if _engine is None:
+        raise RuntimeError("Движок БД не создан: init_engine() вызывается в lifespan")
+    return _engine
+
+
+def get_replica_engines() -> List[AsyncEngine]:
+    return list(_replica_engines)
+
+
+def async_session_maker() -> AsyncSession:
+    """Новая сессия на движке приложения."""
+    if _session_maker is None:
+        raise RuntimeError("Движок БД не создан: init_engine() вызывается в lifespan")
+    return _session_maker()
+
+
+def read_session_maker() -> AsyncSession:
+    """
+    Новая сессия только для чтения: AUTOCOMMIT, без autoflush.
+
+    Если реплики настроены, сессии выдаются на них по кругу; primary
+    читается, когда реплик нет или выставлен read_from_primary.
+    """
+    if _read_session_maker is None:
+        raise RuntimeError("Движок БД не создан: init_engine() вызывается в lifespan")
+    if _replica_cycle is None or read_from_primary.get():
+        return _read_session_maker()
+    return next(_replica_cycle)()
+
+
+def reads_replica(session: AsyncSession) -> bool:
+    """Сессия читает с реплики, которая может отставать от primary."""
+    return session.info.get("replica", False)
 
-settings = Settings()
-engine = create_async_engine(str(settings.postgres_url))
-async_session_maker = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
-)
+
+@event.listens_for(Session, "before_flush")
+def _forbid_read_only_flush(session, flush_context, instances):
+    # в AUTOCOMMIT flush сразу записал бы изменения в базу
+    if session.info.get("read_only"):
+        raise RuntimeError("Сессия только для чтения: запись через неё запрещена")
+
+
+# списки параметров разной длины ("IN ($1, $2, $3)", "VALUES (...), (...)")
+# сводим к одной форме, чтобы selectin по разным страницам считался одним запросом
+_PARAM = r"\$\d+(?:::\w+(?: WITHOUT TIME ZONE| WITH TIME ZONE)?)?"
+_PARAMS_RUN = re.compile(rf"{_PARAM}(?:\s*,\s*{_PARAM})*")
+_ROWS_RUN = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+
+
+def statement_shape(statement: str) -> str:
+    return _ROWS_RUN.sub("(?)", _PARAMS_RUN.sub("?", statement))
+
+
+class QueryStats:
+    """Счётчики SQL одного запроса к API."""
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+
+# выставляется middleware на время запроса; greenlet-ы SQLAlchemy наследуют
+# контекст задачи, поэтому хуки движка видят тот же объект
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+# на класс Engine, а не на конкретный движок: хуки переживают пересоздание
+# движка и работают для любого движка приложения
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if query_stats.get() is not None:
+        context._query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    stats = query_stats.get()
+    start = getattr(context, "_query_start", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
 
 
 uniq_str_an = Annotated[str, mapped_column(Text, unique=True, nullable=False)]
@@ -49,13 +225,39 @@ class BaseServiceModel(AsyncAttrs):
 Base: DeclarativeMeta = declarative_base(metadata=metadata, cls=BaseServiceModel)
 
 
+def on_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Откладывает действие (например, сброс кэша) до успешного коммита сессии."""
+    session.info.setdefault("on_commit", []).append(callback)
+
+
+async def _run_on_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop("on_commit", []):
+        await callback()
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
             await session.commit()
+            await _run_on_commit(session)
         except Exception as e:
             await session.rollback()
             raise e
         finally:
             await session.close()
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для GET-запросов.
+
+    Транзакция не открывается, commit не вызывается: на запрос уходит ровно
+    столько обращений к базе, сколько в нём SELECT-ов. Каждый SELECT видит
+    свой снимок данных, для чтения страницы с подгрузкой связей этого хватает.
+    """
+    # POST-чтение (batch-get) не запись: ReadYourWritesMiddleware смотрит
+    # на эту отметку и не выдаёт cookie чтения с primary
+    request.scope[READ_ONLY_SCOPE_KEY] = True
+    async with read_session_maker() as session:
+        yield session
@@ -6,3 +6,16 @@ class Status(Enum):
     INACTIVE = "inactive"
     PENDING = "pending"
     DELETED = "deleted"
+
+
+class LoaderStrategy(Enum):
+    SELECTIN = "selectin"
+    SUBQUERY = "subquery"
+    JOINED = "joined"
+    NOLOAD = "noload"
+
+
+class CountMode(Enum):
+    NONE = "none"
+    ESTIMATE = "estimate"
+    EXACT = "exact"
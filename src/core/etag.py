@@ -0,0 +1,59 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+import sqlalchemy as sa
+from fastapi import Response, status
+
+
+def row_version(model: Any) -> sa.ColumnElement:
+    """Версия строки: updated_at, а у ни разу не менявшейся - created_at."""
+    return sa.func.coalesce(model.updated_at, model.created_at)
+
+
+def version_of(row: Any) -> datetime:
+    """То же, что row_version, для уже загруженного объекта."""
+    return row.updated_at or row.created_at
+
+
+def entity_etag(id: Any, version: Optional[datetime]) -> Optional[str]:
+    return make_etag(id, version) if version else None
+
+
+def make_etag(*parts: Any) -> str:
+    # слабый: одинаковое содержимое, а не побайтно одинаковый ответ
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def page_etag(rows: Sequence[Sequence[Any]], limit: int) -> str:
+    """
+    ETag страницы по (id, версия) её строк.
+
+    rows - выборка keyset с лишней строкой: от неё зависит только наличие
+    next_cursor, поэтому в ETag идёт флаг, а не сама строка.
+    """
+    return make_etag(*(tuple(row) for row in rows[:limit]), len(rows) > limit)
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    if not if_none_match or etag is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # для If-None-Match сравнение слабое: W/ не учитывается
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def with_etag(response: Response, etag: Optional[str]) -> Response:
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return response
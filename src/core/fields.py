@@ -0,0 +1,49 @@
+from functools import lru_cache
+from typing import FrozenSet, Optional, Type, TypeVar
+
+from pydantic import BaseModel, create_model
+
+from src.exception.client_exception import BadRequestError
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+FIELDS_DESCRIPTION = "Поля ответа через запятую, например id,name; id есть всегда"
+
+
+def parse_fields(
+    fields: Optional[str], schema: Type[BaseModel]
+) -> Optional[FrozenSet[str]]:
+    """`?fields=id,name` -> набор полей схемы; id входит всегда."""
+    if fields is None:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = names - schema.model_fields.keys()
+    if unknown:
+        raise BadRequestError(
+            detail="Неизвестные поля в fields",
+            fields=sorted(unknown),
+            allowed=list(schema.model_fields),
+        )
+    return frozenset(names | {"id"})
+
+
+@lru_cache(maxsize=None)
+def _partial_schema(schema: Type[BaseModel], fields: FrozenSet[str]) -> Type[BaseModel]:
+    # порядок полей как в полной схеме, описания и ограничения сохраняются
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in schema.model_fields.items()
+        if name in fields
+    }
+    return create_model(
+        f"{schema.__name__}Partial", __config__=schema.model_config, **definitions
+    )
+
+
+def read_schema(
+    schema: Type[SchemaT], fields: Optional[FrozenSet[str]]
+) -> Type[SchemaT]:
+    """Схема ответа: полная или урезанная до fields (классы кэшируются)."""
+    if fields is None:
+        return schema
+    return _partial_schema(schema, fields)
@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional, Tuple
+
+import sqlalchemy as sa
+from fastapi import Query, Request
+from pydantic import TypeAdapter, ValidationError as PydanticValidationError
+from sqlalchemy import Select
+from sqlalchemy.orm import QueryableAttribute
+
+from src.core.pagination import keyset
+from src.exception.client_exception import BadRequestError
+
+# параметры, которые объявляет сам роут списка, а не фильтры
+RESERVED_PARAMS = frozenset({"limit", "cursor", "fields", "sort", "count"})
+
+MAX_IN_VALUES = 100
+
+SORT_DESCRIPTION = (
+    "Поле сортировки, с минусом - по убыванию, например -created_at; "
+    "курсор действителен только с той же сортировкой и фильтрами"
+)
+
+_OPERATORS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "in": lambda column, values: column.in_(values),
+    # % и _ из значения экранируются, это поиск подстроки, а не шаблон
+    "ilike": lambda column, value: column.icontains(value, autoescape=True),
+}
+
+TEXT_OPS = frozenset({"eq", "ne", "in", "ilike"})
+RANGE_OPS = frozenset({"eq", "lt", "lte", "gt", "gte"})
+
+
+@dataclass(frozen=True)
+class Condition:
+    name: str
+    op: str
+    value: str
+
+
+@dataclass(frozen=True)
+class ListParams:
+    """Фильтры и сортировка списка в том виде, как пришли в query string."""
+
+    conditions: Tuple[Condition, ...] = ()
+    sort: Optional[str] = None
+
+
+def list_params(
+    request: Request,
+    sort: Optional[str] = Query(None, description=SORT_DESCRIPTION),
+) -> ListParams:
+    """
+    Зависимость роутов списков: `?name__ilike=ann&created_at__gte=2024-01-01`.
+
+    Здесь только синтаксис поле__оператор; допустимые поля и операторы знает
+    репозиторий, он же и отвечает 400 на неизвестные.
+    """
+    conditions = []
+    for key, value in request.query_params.multi_items():
+        if key in RESERVED_PARAMS:
+            continue
+        name, _, op = key.partition("__")
+        conditions.append(Condition(name, op or "eq", value))
+    return ListParams(tuple(conditions), sort)
+
+
+@dataclass(frozen=True)
+class FilterField:
+    """
+    Поле, по которому разрешено фильтровать.
+
+    via - связь "ко многим": условие уходит в EXISTS по ней (полусоединение),
+    строки основной таблицы не размножаются.
+    """
+
+    column: QueryableAttribute
+    ops: frozenset
+    via: Optional[QueryableAttribute] = None
+
+
+@dataclass(frozen=True)
+class Listing:
+    """Белый список фильтров и сортировок модели и их компиляция в SQL."""
+
+    model: Any
+    filters: Mapping[str, FilterField]
+    # сортировать можно только по NOT NULL колонкам с индексом (колонка, id)
+    sorts: Tuple[str, ...]
+    default_sort: str = "created_at"
+
+    def sort_key(self, params: Optional[ListParams]) -> Tuple[str, bool]:
+        sort = (params.sort if params else None) or self.default_sort
+        name = sort.removeprefix("-")
+        if name not in self.sorts:
+            raise BadRequestError(
+                detail="Сортировка по этому полю недоступна",
+                sort=sort,
+                allowed=list(self.sorts),
+            )
+        return name, sort.startswith("-")
+
+    def keys(self, params: Optional[ListParams]) -> Tuple[str, str]:
+        """Атрибуты строки, из которых собирается курсор."""
+        return self.sort_key(params)[0], "id"
+
+    def filtered(self, query: Select, params: Optional[ListParams]) -> Select:
+        if params:
+            query = query.where(*self._conditions(params.conditions))
+        return query
+
+    def apply(
+        self,
+        query: Select,
+        params: Optional[ListParams],
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Select:
+        """WHERE по фильтрам и keyset-страница по (поле сортировки, id)."""
+        query = self.filtered(query, params)
+        name, descending = self.sort_key(params)
+        columns = (getattr(self.model, name), self.model.id)
+        return keyset(query, columns, limit, cursor, descending)
+
+    def _conditions(self, conditions: Tuple[Condition, ...]) -> List[sa.ColumnElement]:
+        clauses = []
+        for condition in conditions:
+            spec = self.filters.get(condition.name)
+            if spec is None:
+                raise BadRequestError(
+                    detail="Фильтр по этому полю недоступен",
+                    field=condition.name,
+                    allowed=list(self.filters),
+                )
+            if condition.op not in spec.ops:
+                raise BadRequestError(
+                    detail="Оператор недоступен для этого поля",
+                    field=condition.name,
+                    op=condition.op,
+                    allowed=sorted(spec.ops),
+                )
+            clause = _OPERATORS[condition.op](spec.column, self._value(spec, condition))
+            clauses.append(spec.via.any(clause) if spec.via is not None else clause)
+        return clauses
+
+    def _value(self, spec: FilterField, condition: Condition) -> Any:
+        python_type = spec.column.type.python_type
+        if condition.op == "in":
+            raw = [v for v in condition.value.split(",") if v]
+            if not raw or len(raw) > MAX_IN_VALUES:
+                raise BadRequestError(
+                    detail=f"Для in нужно от 1 до {MAX_IN_VALUES} значений",
+                    field=condition.name,
+                )
+            return [_convert(python_type, condition, v) for v in raw]
+        return _convert(python_type, condition, condition.value)
+
+
+@lru_cache(maxsize=None)
+def _adapter(python_type: type) -> TypeAdapter:
+    return TypeAdapter(python_type)
+
+
+def _convert(python_type: type, condition: Condition, raw: str) -> Any:
+    if python_type is str:
+        return raw
+    try:
+        value = _adapter(python_type).validate_strings(raw)
+    except PydanticValidationError:
+        raise BadRequestError(
+            detail="Некорректное значение фильтра", field=condition.name, value=raw
+        )
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # в базе локальное время без зоны, как его пишет datetime.now
+        value = value.astimezone().replace(tzinfo=None)
+    return value
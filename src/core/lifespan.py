@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import configure_mappers
+
+from src.core.db import (
+    dispose_engine,
+    get_engine,
+    get_replica_engines,
+    init_engine,
+    read_session_maker,
+    settings,
+)
+from src.core.enums import LoaderStrategy
+from src.core.pagination import encode_cursor
+from src.repositories.author import AuthorRepository
+from src.repositories.course import CourseRepository
+from src.repositories.students import StudentRepository
+from src.repositories.user import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def _open_connections(engine: AsyncEngine, count: int) -> None:
+    # соединения открываются одновременно и возвращаются в пул тёплыми
+    async with AsyncExitStack() as stack:
+        connections = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(count))
+        )
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+
+
+async def _compile_hot_statements() -> None:
+    # SQLAlchemy кэширует скомпилированный SQL по форме запроса, так что
+    # достаточно выполнить каждую форму один раз; курсор - чтобы попала и
+    # ветка keyset с условием по (created_at, id)
+    missing = uuid.UUID(int=0)
+    cursor = encode_cursor([datetime.min, missing])
+    # GET-роуты читают через read-сессию, прогреваем тот же путь
+    async with read_session_maker() as session:
+        for strategy in (LoaderStrategy.JOINED, LoaderStrategy.SELECTIN):
+            for page_cursor in (None, cursor):
+                await AuthorRepository(session).get_all(1, page_cursor, strategy)
+                await StudentRepository(session).get_all(1, page_cursor, strategy)
+                await UserRepository(session).get_all(1, page_cursor, strategy)
+            await AuthorRepository(session).get_id(strategy, id=missing)
+            await StudentRepository(session).get_id(missing, strategy)
+            await UserRepository(session).get_id(strategy, id=missing)
+        await AuthorRepository(session).get_id(LoaderStrategy.NOLOAD, id=missing)
+        await UserRepository(session).get_id(LoaderStrategy.NOLOAD, id=missing)
+        for page_cursor in (None, cursor):
+            await CourseRepository(session).get_all(1, page_cursor)
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Делает до первого запроса то, за что иначе платит первый запрос."""
+    start = time.perf_counter()
+    configure_mappers()
+    app.openapi()
+    try:
+        engines = [get_engine(), *get_replica_engines()]
+        for engine in engines:
+            await _open_connections(
+                engine, settings.warmup_connections or settings.db_pool_size
+            )
+        # у каждой реплики свой кэш компиляции, а read-сессии выдаются по
+        # кругу: столько проходов, сколько реплик, прогревают все
+        for _ in range(len(engines) - 1 or 1):
+            await _compile_hot_statements()
+    except Exception as e:
+        # без базы приложение всё равно поднимается, как и раньше
+        logger.warning(f"Прогрев соединений и запросов не удался: {e}")
+        return
+    logger.info(f"Прогрев завершён за {(time.perf_counter() - start) * 1000:.0f} мс")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    init_engine()
+    try:
+        if settings.warmup_enabled:
+            await warm_up(app)
+        yield
+    finally:
+        await dispose_engine()
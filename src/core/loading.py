@@ -0,0 +1,62 @@
+from typing import Any, FrozenSet, List, Optional, Sequence
+
+from sqlalchemy.engine import Result
+from sqlalchemy.orm import (
+    Load,
+    QueryableAttribute,
+    joinedload,
+    load_only,
+    noload,
+    selectinload,
+    subqueryload,
+)
+
+from src.core.enums import LoaderStrategy
+
+_LOADERS = {
+    LoaderStrategy.SELECTIN: selectinload,
+    LoaderStrategy.SUBQUERY: subqueryload,
+    LoaderStrategy.JOINED: joinedload,
+    LoaderStrategy.NOLOAD: noload,
+}
+
+
+def load_option(attr: QueryableAttribute, strategy: LoaderStrategy) -> Load:
+    """Опция загрузки связи выбранной стратегией."""
+    return _LOADERS[strategy](attr)
+
+
+def field_options(
+    model: Any,
+    fields: Optional[FrozenSet[str]],
+    relationships: Sequence[QueryableAttribute],
+    strategy: LoaderStrategy,
+    required: Sequence[str] = (),
+) -> List[Load]:
+    """
+    Опции загрузки под ?fields=: только запрошенные колонки (load_only) и
+    связи, остальные связи - noload, без JOIN и без лишних SELECT.
+
+    required - колонки, нужные самому запросу (ключ keyset-пагинации).
+    Без fields всё как раньше: все колонки, связи выбранной стратегией.
+    """
+    if fields is None:
+        return [load_option(attr, strategy) for attr in relationships]
+    options = [
+        load_option(attr, strategy) if attr.key in fields else noload(attr)
+        for attr in relationships
+    ]
+    columns = [
+        getattr(model, key)
+        for key in model.__mapper__.column_attrs.keys()
+        if key in fields or key in required
+    ]
+    options.append(load_only(*columns))
+    return options
+
+
+def scalars(result: Result, strategy: LoaderStrategy) -> List[Any]:
+    # joinedload коллекции размножает строки родителя, только тогда нужен unique()
+    if strategy is LoaderStrategy.JOINED:
+        result = result.unique()
+    return result.scalars().all()
@@ -0,0 +1,59 @@
+import os
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# метки маршрута - шаблон пути (/api/v1/authors_books/{id}), а не сам путь,
+# иначе каждый id порождает новый временной ряд
+REQUESTS = Counter(
+    "http_requests_total",
+    "Число обработанных запросов",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки запроса",
+    ["method", "route", "status"],
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Размер тела ответа",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Запросы, которые сейчас обрабатываются",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+
+def multiprocess_dir() -> str | None:
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    # с несколькими воркерами каждый пишет свои значения в файлы каталога,
+    # а отдающий /metrics воркер складывает их все
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Убирает live-гейджи завершившегося воркера (вызывается из мастера)."""
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
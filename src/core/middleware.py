@@ -0,0 +1,265 @@
+import logging
+import time
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.compression import Codec, CompressedCache, negotiate
+from src.core.db import (
+    READ_ONLY_SCOPE_KEY,
+    QueryStats,
+    query_stats,
+    read_from_primary,
+)
+from src.core.metrics import IN_PROGRESS, REQUEST_DURATION, REQUESTS, RESPONSE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Чистый ASGI-middleware для метрик запросов.
+
+    BaseHTTPMiddleware оборачивает ответ в лишний поток и ломает стриминг,
+    поэтому здесь только перехват send: статус из http.response.start,
+    размер из http.response.body.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: tuple = ("/metrics",)) -> None:
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            # роутер кладёт найденный маршрут в scope; без него - 404 мимо роутов
+            route = scope.get("route")
+            template = route.path if route is not None else "<unmatched>"
+            status = str(status_code)
+            REQUESTS.labels(method, template, status).inc()
+            REQUEST_DURATION.labels(method, template, status).observe(duration)
+            RESPONSE_SIZE.labels(method, template).observe(size)
+
+
+class ServerTimingMiddleware:
+    """
+    Считает SQL за время запроса и отдаёт итог в заголовке Server-Timing.
+
+    Заголовок уходит вместе с началом ответа, поэтому запросы, выполненные
+    при стриминге тела (NDJSON-выгрузка), в него не попадают, но учитываются
+    в проверке на N+1 после окончания ответа.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - start) * 1000
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+                    f"app;dur={total:.2f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.reset(token)
+            self._check_n_plus_one(scope, stats)
+
+    def _check_n_plus_one(self, scope: Scope, stats: QueryStats) -> None:
+        for shape, count in stats.shapes.items():
+            if count > self.n_plus_one_threshold:
+                route = scope.get("route")
+                logger.warning(
+                    f"Возможный N+1: {count} одинаковых запросов за "
+                    f"{scope['method']} {route.path if route else scope['path']}: "
+                    f"{' '.join(shape.split())[:200]}"
+                )
+
+
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "x-read-primary"
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ReadYourWritesMiddleware:
+    """
+    Чтение своих записей при репликах.
+
+    Успешный изменяющий запрос выдаёт клиенту cookie на window секунд; пока
+    она жива, GET-роуты этого клиента читают с primary, а не с реплики,
+    которая может отставать. Клиенты без cookie просят primary явно
+    заголовком X-Read-Primary: 1.
+    """
+
+    def __init__(self, app: ASGIApp, window: int) -> None:
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        primary = headers.get(READ_PRIMARY_HEADER) == "1" or (
+            READ_PRIMARY_COOKIE in cookie_parser(headers.get("cookie", ""))
+        )
+        is_write = scope["method"] in _WRITE_METHODS
+
+        async def send_wrapper(message: Message) -> None:
+            # отметку ставит get_read_session, к ответу она уже в scope
+            if (
+                is_write
+                and message["type"] == "http.response.start"
+                and message["status"] < 400
+                and not scope.get(READ_ONLY_SCOPE_KEY)
+            ):
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{READ_PRIMARY_COOKIE}=1; Max-Age={self.window}; Path=/; "
+                    "HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        token = read_from_primary.set(primary)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            read_from_primary.reset(token)
+
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов по Accept-Encoding: zstd, br или gzip.
+
+    Тело меньше minimum_size уходит как есть. Готовое тело с ETag сжимается
+    один раз: тот же ETag по тому же адресу и в той же кодировке берётся из
+    CompressedCache. Стриминг (NDJSON-выгрузка) сжимается по чанкам со
+    сбросом буфера после каждого, чтобы строки доходили до клиента сразу.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        codecs: Dict[str, Codec],
+        minimum_size: int,
+        cache: Optional[CompressedCache] = None,
+    ) -> None:
+        self.app = app
+        self.codecs = codecs
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codec = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.codecs)
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+
+        # начало ответа придерживаем до первого чанка тела: только по нему
+        # видно, сжимать ли и целиком или потоком
+        start: Optional[Message] = None
+        stream = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, stream, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is not None:
+                data = stream.chunk(body) if body else b""
+                if not more_body:
+                    data += stream.finish()
+                await send({**message, "body": data})
+                return
+
+            headers = MutableHeaders(scope=start)
+            content_type = headers.get("content-type", "")
+            if (
+                "content-encoding" in headers
+                or not content_type.startswith(_COMPRESSIBLE_TYPES)
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = codec.name
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+                stream = codec.stream()
+                await send(start)
+                await send({**message, "body": stream.chunk(body)})
+                return
+
+            data = self._compress(scope, headers.get("etag"), codec, body)
+            headers["Content-Length"] = str(len(data))
+            await send(start)
+            await send({**message, "body": data})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(
+        self, scope: Scope, etag: Optional[str], codec: Codec, body: bytes
+    ) -> bytes:
+        if self.cache is None or etag is None:
+            return codec.compress(body)
+        key = (scope["path"], scope["query_string"], etag, codec.name)
+        data = self.cache.get(key)
+        if data is None:
+            data = codec.compress(body)
+            self.cache.set(key, data)
+        return data
@@ -0,0 +1,94 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy import Select
+
+from src.exception.client_exception import BadRequestError
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return uuid.UUID(value["uuid"])
+        raise ValueError(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Упаковывает значения ключа сортировки последней строки в непрозрачный курсор."""
+    raw = json.dumps([_dump_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = [_load_value(v) for v in json.loads(base64.urlsafe_b64decode(padded))]
+    except (ValueError, TypeError):
+        raise BadRequestError(detail="Некорректный курсор пагинации", cursor=cursor)
+    if len(values) != size:
+        raise BadRequestError(detail="Некорректный курсор пагинации", cursor=cursor)
+    return values
+
+
+def _check_types(cursor: str, values: List[Any], columns: Sequence[Any]) -> None:
+    # курсор от другой сортировки: строка вместо даты и т.п. ушла бы в драйвер
+    for value, column in zip(values, columns):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            continue
+        if not isinstance(value, python_type):
+            raise BadRequestError(detail="Некорректный курсор пагинации", cursor=cursor)
+
+
+def keyset(
+    query: Select,
+    columns: Sequence[sa.ColumnElement],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Select:
+    """
+    Keyset-пагинация: вместо OFFSET продолжаем с позиции курсора,
+    поэтому страница N стоит столько же, сколько первая.
+
+    Берём на одну строку больше, чтобы понять, есть ли следующая страница.
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(columns))
+        _check_types(cursor, values, columns)
+        key = sa.tuple_(*columns)
+        query = query.where(key < tuple(values) if descending else key > tuple(values))
+    order = [c.desc() if descending else c.asc() for c in columns]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[Any], keys: Sequence[str], limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """Отрезает лишнюю строку и строит курсор следующей страницы."""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, key) for key in keys])
+    return items, next_cursor
@@ -0,0 +1,100 @@
+import logging
+import os
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# record_info соединения: сколько оно открывалось, если открыто этой выдачей
+_CONNECT_SECONDS = "connect_seconds"
+
+
+class PoolMetrics:
+    """Счётчики пула соединений одного воркера."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connects = 0
+        self.connect_total = 0.0
+
+    def observe(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        if wait > self.wait_max:
+            self.wait_max = wait
+
+    def observe_connect(self, seconds: float) -> None:
+        self.connects += 1
+        self.connect_total += seconds
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, который замеряет ожидание соединения и таймауты.
+
+    Ожидание - время выдачи без открытия нового соединения: открытие
+    считается отдельно, в connects/connect_avg_ms.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            logger.warning(f"Таймаут ожидания соединения из пула: {pool_stats(self)}")
+            raise
+        elapsed = time.perf_counter() - start
+        self.metrics.observe(
+            elapsed - connection.record_info.pop(_CONNECT_SECONDS, 0.0)
+        )
+        return connection
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        record = super()._create_connection()
+        seconds = time.perf_counter() - start
+        record.record_info[_CONNECT_SECONDS] = seconds
+        self.metrics.observe_connect(seconds)
+        return record
+
+
+def pool_stats(pool: InstrumentedQueuePool) -> Dict[str, Any]:
+    metrics = pool.metrics
+    return {
+        "pid": os.getpid(),
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.db_max_overflow,
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "wait_avg_ms": (
+            metrics.wait_total / metrics.checkouts * 1000 if metrics.checkouts else 0.0
+        ),
+        "wait_max_ms": metrics.wait_max * 1000,
+        "connects": metrics.connects,
+        "connect_avg_ms": (
+            metrics.connect_total / metrics.connects * 1000 if metrics.connects else 0.0
+        ),
+    }
+
+
+def engine_pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    return pool_stats(engine.pool)
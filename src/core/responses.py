@@ -0,0 +1,38 @@
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+
+def _dump_model(model: BaseModel) -> bytes:
+    # сериализатор pydantic-core пишет сразу в bytes, без промежуточного dict
+    return model.__pydantic_serializer__.to_json(model)
+
+
+def ndjson_lines(models: Iterable[BaseModel]) -> bytes:
+    return b"".join(_dump_model(model) + b"\n" for model in models)
+
+
+class ModelResponse(JSONResponse):
+    """
+    JSON-ответ для уже провалидированных схем.
+
+    Сервисы и так возвращают схемы чтения, поэтому роутеры отдают их в этом
+    ответе, а модель ответа указывают только в декораторе (для OpenAPI):
+    FastAPI не валидирует повторно возвращённый Response и не гоняет его
+    через jsonable_encoder. Всё остальное кодируется orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return _dump_model(content)
+        if isinstance(content, list) and all(
+            isinstance(item, BaseModel) for item in content
+        ):
+            return b"[" + b",".join(_dump_model(item) for item in content) + b"]"
+        return orjson.dumps(content)
+
+
+class NDJSONResponse(StreamingResponse):
+    media_type = "application/x-ndjson"
@@ -0,0 +1,44 @@
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import MappedColumn, mapped_column
+
+# 'simple' без стемминга: в именах и названиях смешаны русский и английский
+TS_CONFIG = "simple"
+
+
+def search_vector_column(source: str, weight: str) -> MappedColumn:
+    """
+    Сгенерированная (STORED) tsvector-колонка: Postgres сам пересчитывает её
+    при INSERT/UPDATE source. deferred - в обычные SELECT она не попадает.
+    """
+    return mapped_column(
+        TSVECTOR,
+        sa.Computed(
+            f"setweight(to_tsvector('{TS_CONFIG}', coalesce({source}, '')), '{weight}')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+
+def ts_query(text: str) -> sa.ColumnElement:
+    # синтаксис как у поисковиков: "фраза", or, -исключение; не падает на мусоре
+    return sa.func.websearch_to_tsquery(sa.literal_column(f"'{TS_CONFIG}'"), text)
+
+
+def trigram_index(name: str, column: str) -> sa.Index:
+    """GIN-индекс pg_trgm: поиск по части строки и с опечатками."""
+    return sa.Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    )
+
+
+def word_similarity(text: str, column: sa.ColumnElement) -> sa.ColumnElement:
+    return sa.func.word_similarity(text, column)
+
+
+def word_similar(text: str, column: sa.ColumnElement) -> sa.ColumnElement:
+    # text <% column - то же, что word_similarity >= порога
+    # pg_trgm.word_similarity_threshold, но оператор идёт по GIN-индексу,
+    # а функция в WHERE - нет
+    return sa.literal(text, sa.Text).bool_op("<%")(column)
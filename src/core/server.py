@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+from importlib.util import find_spec
+from typing import Any, Dict, Optional
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+# запас на lifespan shutdown между концом дренажа и SIGKILL от мастера
+SHUTDOWN_MARGIN = 5
+
+
+def event_loop_name() -> str:
+    # loop="auto" и http="auto" в uvicorn сами берут uvloop и httptools, если
+    # они установлены (extra uvicorn[standard]); здесь только для лога
+    loop = "uvloop" if find_spec("uvloop") else "asyncio"
+    http = "httptools" if find_spec("httptools") else "h11"
+    return f"{loop}/{http}"
+
+
+def prepare_metrics_dir() -> Optional[str]:
+    """
+    Каталог для метрик prometheus_client, общий для всех воркеров.
+
+    Возвращает путь, если каталог временный и создан здесь: его удаляет
+    on_exit мастера. Заданный в PROMETHEUS_MULTIPROC_DIR не трогаем.
+    """
+    # должен быть задан до импорта src.core.metrics, иначе метрики
+    # останутся в памяти процесса и /metrics покажет только один воркер
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return None
+    path = tempfile.mkdtemp(prefix="prometheus-")
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path
+
+
+class AppUvicornWorker(UvicornWorker):
+    """UvicornWorker, который дренирует запросы в пределах graceful_timeout."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = max(
+            self.cfg.graceful_timeout - SHUTDOWN_MARGIN, 1
+        )
+
+
+def when_ready(server) -> None:
+    server.log.info(f"Воркеры на {event_loop_name()}")
+
+
+def post_fork(server, worker) -> None:
+    # поток QueueListener не переживает fork; движок БД мастер не создаёт,
+    # его поднимает lifespan уже в воркере
+    from src.core.config_logging import setup_logging
+
+    setup_logging()
+
+
+def child_exit(server, worker) -> None:
+    from src.core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
+
+
+class GunicornApplication(BaseApplication):
+    def __init__(self, options: Dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from src.application import get_app
+
+        return get_app()
+
+
+def run(
+    host: str,
+    port: int,
+    workers: int,
+    backlog: int,
+    keepalive: int,
+    graceful_timeout: int,
+    preload: bool,
+) -> None:
+    metrics_dir = prepare_metrics_dir()
+
+    def on_exit(server) -> None:
+        # .db-файлы воркеров от прошлых запусков не копятся в /tmp
+        if metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    GunicornApplication(
+        {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "worker_class": "src.core.server.AppUvicornWorker",
+            "backlog": backlog,
+            "keepalive": keepalive,
+            "graceful_timeout": graceful_timeout + SHUTDOWN_MARGIN,
+            "preload_app": preload,
+            "when_ready": when_ready,
+            "post_fork": post_fork,
+            "child_exit": child_exit,
+            "on_exit": on_exit,
+        }
+    ).run()
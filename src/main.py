@@ -1,16 +1,58 @@
-import uvicorn
-import asyncio
-import logging
+"""
+Запуск приложения: gunicorn-мастер и uvicorn-воркеры.
 
-logger = logging.getLogger(__name__)
+    python -m src.main
+    python -m src.main --workers 4 --port 8080 --no-preload
 
+Значения по умолчанию берутся из настроек server_* (переменные окружения
+или .env). SIGTERM мастеру: новые соединения не принимаются, текущие
+запросы дорабатывают в пределах --graceful-timeout.
+"""
 
-async def main() -> None:
-    uvicorn.run("application:get_app", host="localhost", port=8000, factory=True)
+import argparse
+import os
+
+from src.core.config import Settings
+from src.core.server import run
+
+
+def parse_args(settings: Settings) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.server_workers or os.cpu_count() or 1,
+        help="по умолчанию по числу CPU",
+    )
+    parser.add_argument("--backlog", type=int, default=settings.server_backlog)
+    parser.add_argument("--keep-alive", type=int, default=settings.server_keepalive)
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=settings.server_graceful_timeout
+    )
+    parser.add_argument(
+        "--preload",
+        action=argparse.BooleanOptionalAction,
+        default=settings.server_preload,
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args(Settings())
+    run(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        backlog=args.backlog,
+        keepalive=args.keep_alive,
+        graceful_timeout=args.graceful_timeout,
+        preload=args.preload,
+    )
 
 
 if __name__ == "__main__":
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        logger.info("Приложение остановлено")
+    main()
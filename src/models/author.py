@@ -5,6 +5,7 @@ from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
 
 from src.core.db import Base
+from src.core.search import search_vector_column
 
 
 metadata = sa.MetaData()
@@ -12,6 +13,11 @@ metadata = sa.MetaData()
 
 class Author(Base):
     __tablename__ = "authors"
+    __table_args__ = (
+        sa.Index("ix_authors_created_at_id", "created_at", "id"),
+        sa.Index("ix_authors_name_id", "name", "id"),
+        sa.Index("ix_authors_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(sa.String(50))
@@ -19,6 +25,8 @@ class Author(Base):
     updated_at: Mapped[datetime | None] = mapped_column(
         onupdate=datetime.now, nullable=True
     )
+    # полнотекстовый поиск; имя весит больше названий книг (A > B)
+    search_vector: Mapped[str] = search_vector_column("name", "A")
 
     books: Mapped[List["Book"]] = relationship(
         back_populates="author", cascade="all, delete-orphan", passive_deletes=True
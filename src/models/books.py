@@ -5,6 +5,7 @@ from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
 
 from src.core.db import Base
+from src.core.search import search_vector_column
 from src.models.author import Author
 
 
@@ -13,6 +14,9 @@ metadata = sa.MetaData()
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        sa.Index("ix_books_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     title: Mapped[List[str]] = mapped_column(sa.String())
@@ -20,9 +24,10 @@ class Book(Base):
     updated_at: Mapped[datetime | None] = mapped_column(
         onupdate=datetime.now, nullable=True
     )
+    search_vector: Mapped[str] = search_vector_column("title", "B")
 
     author_id: Mapped[uuid.UUID] = mapped_column(
-        sa.ForeignKey("authors.id", ondelete="CASCADE"), nullable=False
+        sa.ForeignKey("authors.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     author: Mapped["Author"] = relationship(back_populates="books")
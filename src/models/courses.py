@@ -7,15 +7,15 @@ from datetime import datetime
 from src.core.db import Base
 from src.models.student import Student
 
-
 metadata = sa.MetaData()
 
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (sa.Index("ix_courses_created_at_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    title: Mapped[str] = mapped_column(sa.String(100), nullable=False)
+    title: Mapped[str] = mapped_column(sa.String(100), nullable=False, unique=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.now, nullable=False)
     updated_at: Mapped[datetime | None] = mapped_column(
         onupdate=datetime.now, nullable=True
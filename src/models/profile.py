@@ -5,6 +5,7 @@ from datetime import datetime
 
 from src.core.db import Base
 from src.core.db import uniq_str_an
+from src.core.search import trigram_index
 
 
 metadata = sa.MetaData()
@@ -12,6 +13,10 @@ metadata = sa.MetaData()
 
 class Profile(Base):
     __tablename__ = "profiles"
+    __table_args__ = (
+        trigram_index("ix_profiles_first_name_trgm", "first_name"),
+        trigram_index("ix_profiles_last_name_trgm", "last_name"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     first_name: Mapped[uniq_str_an]
@@ -17,7 +17,10 @@ student_course: sa.Table = sa.Table(
         "student_id", sa.ForeignKey("students.id", ondelete="CASCADE"), primary_key=True
     ),
     sa.Column(
-        "course_id", sa.ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True
+        "course_id",
+        sa.ForeignKey("courses.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
     ),
     extend_existing=True,
 )
@@ -25,6 +28,10 @@ student_course: sa.Table = sa.Table(
 
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        sa.Index("ix_students_created_at_id", "created_at", "id"),
+        sa.Index("ix_students_name_id", "name", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(sa.String(100), nullable=False)
@@ -6,6 +6,7 @@ from datetime import datetime
 
 from src.core.db import Base
 from src.core.db import uniq_str_an
+from src.core.search import trigram_index
 
 from src.models.profile import Profile
 
@@ -15,6 +16,11 @@ metadata = sa.MetaData()
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        sa.Index("ix_users_created_at_id", "created_at", "id"),
+        trigram_index("ix_users_username_trgm", "username"),
+        trigram_index("ix_users_email_trgm", "email"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     username: Mapped[uniq_str_an]
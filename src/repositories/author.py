@@ -1,15 +1,35 @@
 import uuid
-from typing import List, Optional
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from datetime import datetime
+from typing import AsyncIterator, FrozenSet, List, Optional, Tuple
+import sqlalchemy as sa
+from sqlalchemy import Row, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.batch import any_id
+from src.core.counting import count_rows
+from src.core.enums import CountMode, LoaderStrategy
+from src.core.etag import row_version
+from src.core.filters import RANGE_OPS, TEXT_OPS, FilterField, ListParams, Listing
+from src.core.loading import field_options, load_option, scalars
+from src.core.pagination import encode_cursor, keyset, split_page
+from src.core.search import ts_query
 from src.models.author import Author
+from src.models.books import Book
 
 from src.schemas.author import SAuthorCreate, SAuthorUpdate
 
 
 class AuthorRepository:
+    listing = Listing(
+        Author,
+        filters={
+            "name": FilterField(Author.name, TEXT_OPS),
+            "created_at": FilterField(Author.created_at, RANGE_OPS),
+            "updated_at": FilterField(Author.updated_at, RANGE_OPS),
+        },
+        sorts=("created_at", "name"),
+    )
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -17,25 +37,174 @@ class AuthorRepository:
         author, books = author_data.to_orm_models()
         return author, books
 
-    async def get_id(self, **filter_by) -> Optional[Author]:
-        query = select(Author).options(joinedload(Author.books)).filter_by(**filter_by)
+    async def bulk_create(self, authors: List[SAuthorCreate]) -> List[uuid.UUID]:
+        # executemany по таблицам, без ORM-объектов: SQLAlchemy ("insertmanyvalues")
+        # склеивает строки в многострочные INSERT ... VALUES ... RETURNING
+        # и компилирует выражение один раз, а не на каждый набор значений
+        now = datetime.now()
+        author_rows, book_rows = [], []
+        for author in authors:
+            author_id = uuid.uuid4()
+            author_rows.append({"id": author_id, "name": author.name, "created_at": now})
+            book_rows.extend(
+                {
+                    "id": uuid.uuid4(),
+                    "title": book.title,
+                    "created_at": now,
+                    "author_id": author_id,
+                }
+                for book in author.books
+            )
+        authors_table = Author.__table__
+        result = await self.session.execute(
+            insert(authors_table).returning(
+                authors_table.c.id, sort_by_parameter_order=True
+            ),
+            author_rows,
+        )
+        ids = result.scalars().all()
+        if book_rows:
+            await self.session.execute(insert(Book.__table__), book_rows)
+        return ids
+
+    async def get_id(
+        self,
+        strategy: LoaderStrategy = LoaderStrategy.JOINED,
+        fields: Optional[FrozenSet[str]] = None,
+        **filter_by,
+    ) -> Optional[Author]:
+        query = (
+            select(Author)
+            .options(*field_options(Author, fields, [Author.books], strategy))
+            .filter_by(**filter_by)
+        )
         result = await self.session.execute(query)
-        return result.unique().scalar()
+        rows = scalars(result, strategy)
+        return rows[0] if rows else None
 
-    async def get_all(
-        self, skip: int = 0, limit: int = 100, **filter_by
+    async def get_many(
+        self,
+        ids: List[uuid.UUID],
+        strategy: LoaderStrategy = LoaderStrategy.SELECTIN,
+        fields: Optional[FrozenSet[str]] = None,
     ) -> List[Author]:
+        """Записи по списку id одним запросом; порядок не гарантирован."""
+        # коллекция: selectin - второй запрос по тем же id, без размножения строк
+        query = (
+            select(Author)
+            .options(*field_options(Author, fields, [Author.books], strategy))
+            .where(any_id(Author.id, ids))
+        )
+        result = await self.session.execute(query)
+        return scalars(result, strategy)
+
+    async def get_all(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        strategy: LoaderStrategy = LoaderStrategy.SELECTIN,
+        fields: Optional[FrozenSet[str]] = None,
+        params: Optional[ListParams] = None,
+        **filter_by,
+    ) -> Tuple[List[Author], Optional[str]]:
+        # поле сортировки нужно курсору следующей страницы, даже если его не просили
+        keys = self.listing.keys(params)
         query = (
             select(Author)
-            .options(joinedload(Author.books))
+            .options(*field_options(Author, fields, [Author.books], strategy, keys))
             .filter_by(**filter_by)
-            .offset(skip)
-            .limit(limit)
         )
+        query = self.listing.apply(query, params, limit, cursor)
         result = await self.session.execute(query)
-        return result.unique().scalars().all()
+        return split_page(scalars(result, strategy), keys, limit)
+
+    async def get_version(self, author_id: uuid.UUID) -> Optional[datetime]:
+        return await self.session.scalar(
+            select(row_version(Author)).where(Author.id == author_id)
+        )
+
+    async def get_page_versions(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        params: Optional[ListParams] = None,
+    ) -> List[Row]:
+        """(id, версия) строк страницы get_all, без связей: хватает на ETag."""
+        query = select(Author.id, row_version(Author))
+        query = self.listing.apply(query, params, limit, cursor)
+        return (await self.session.execute(query)).all()
+
+    async def count(
+        self, mode: CountMode, params: Optional[ListParams] = None
+    ) -> Optional[int]:
+        """Всего строк под фильтрами params: оценкой или точно, см. CountMode."""
+        query = self.listing.filtered(select(Author.id), params)
+        return await count_rows(self.session, query, mode)
+
+    async def search(
+        self, text: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[Author, float]], Optional[str]]:
+        """
+        Авторы, у которых слова запроса есть в имени или в названиях книг,
+        по убыванию ранга; страницы keyset по (rank, id).
+        """
+        query = ts_query(text)
+        # кандидатов находят GIN-индексы обеих таблиц, ранг автора - сумма
+        # рангов имени и всех его подходящих книг
+        hits = sa.union_all(
+            select(
+                Author.id.label("author_id"),
+                sa.func.ts_rank(Author.search_vector, query).label("rank"),
+            ).where(Author.search_vector.bool_op("@@")(query)),
+            select(Book.author_id, sa.func.ts_rank(Book.search_vector, query)).where(
+                Book.search_vector.bool_op("@@")(query)
+            ),
+        ).subquery()
+        ranked = (
+            select(
+                hits.c.author_id,
+                sa.cast(sa.func.sum(hits.c.rank), sa.Double).label("rank"),
+            )
+            .group_by(hits.c.author_id)
+            .subquery()
+        )
+        statement = (
+            select(Author, ranked.c.rank)
+            .join(ranked, ranked.c.author_id == Author.id)
+            .options(load_option(Author.books, LoaderStrategy.SELECTIN))
+        )
+        statement = keyset(
+            statement, (ranked.c.rank, Author.id), limit, cursor, descending=True
+        )
+        rows = (await self.session.execute(statement)).all()
+        items = [(author, rank) for author, rank in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit and items:
+            author, rank = items[-1]
+            next_cursor = encode_cursor([rank, author.id])
+        return items, next_cursor
+
+    async def stream_all(self, chunk_size: int) -> AsyncIterator[List[Author]]:
+        # серверный курсор: в памяти одновременно не больше chunk_size строк;
+        # joinedload коллекций с yield_per несовместим, поэтому selectin
+        query = (
+            select(Author)
+            .options(load_option(Author.books, LoaderStrategy.SELECTIN))
+            .order_by(Author.created_at, Author.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.scalars().partitions():
+            yield partition
 
-    async def update(self, author_id: uuid.UUID, author_data: SAuthorUpdate) -> Author:
+    async def update(
+        self, author_id: uuid.UUID, author_data: SAuthorUpdate
+    ) -> Optional[Author]:
         author = await self.get_id(id=author_id)
+        if author is None:
+            return None
         author_data.apply_updates(author)
+        # версия автора - это и версия его книг: ETag должен смениться,
+        # даже если поменялись только книги
+        author.updated_at = datetime.now()
         return author
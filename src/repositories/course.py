@@ -1,26 +1,94 @@
-from typing import List
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, FrozenSet, List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.counting import count_rows
+from src.core.enums import CountMode, LoaderStrategy
+from src.core.etag import row_version
+from src.core.filters import RANGE_OPS, TEXT_OPS, FilterField, ListParams, Listing
+from src.core.loading import field_options
+from src.core.pagination import split_page
 from src.models.courses import Course
 
 from src.schemas.courses import SCourseCreate
 
 
 class CourseRepository:
+    listing = Listing(
+        Course,
+        filters={
+            "title": FilterField(Course.title, TEXT_OPS),
+            "created_at": FilterField(Course.created_at, RANGE_OPS),
+            "updated_at": FilterField(Course.updated_at, RANGE_OPS),
+        },
+        sorts=("created_at", "title"),
+    )
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def find(self, course_titles: List[str]) -> List[Course]:
-        query = select(Course).filter(Course.title.in_(course_titles))
+    async def find(
+        self, course_titles: List[str], fields: Optional[FrozenSet[str]] = None
+    ) -> List[Course]:
+        query = (
+            select(Course)
+            .options(*field_options(Course, fields, [], LoaderStrategy.NOLOAD))
+            .filter(Course.title.in_(course_titles))
+        )
         result = await self.session.execute(query)
         return result.scalars().all()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Course]:
-        query = select(Course).offset(skip).limit(limit)
+    async def get_all(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None,
+        params: Optional[ListParams] = None,
+    ) -> Tuple[List[Course], Optional[str]]:
+        keys = self.listing.keys(params)
+        query = select(Course).options(
+            *field_options(Course, fields, [], LoaderStrategy.NOLOAD, keys)
+        )
+        query = self.listing.apply(query, params, limit, cursor)
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return split_page(result.scalars().all(), keys, limit)
+
+    async def get_version(self, course_id: uuid.UUID) -> Optional[datetime]:
+        return await self.session.scalar(
+            select(row_version(Course)).where(Course.id == course_id)
+        )
+
+    async def get_page_versions(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        params: Optional[ListParams] = None,
+    ) -> List[Row]:
+        """(id, версия) строк страницы get_all, без связей: хватает на ETag."""
+        query = select(Course.id, row_version(Course))
+        query = self.listing.apply(query, params, limit, cursor)
+        return (await self.session.execute(query)).all()
+
+    async def count(
+        self, mode: CountMode, params: Optional[ListParams] = None
+    ) -> Optional[int]:
+        """Всего строк под фильтрами params: оценкой или точно, см. CountMode."""
+        query = self.listing.filtered(select(Course.id), params)
+        return await count_rows(self.session, query, mode)
+
+    async def stream_all(self, chunk_size: int) -> AsyncIterator[List[Course]]:
+        query = (
+            select(Course)
+            .order_by(Course.created_at, Course.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.scalars().partitions():
+            yield partition
 
     async def create(self, courses_data: List[SCourseCreate]) -> List[Course]:
         new_courses = [course.to_orm_model() for course in courses_data]
@@ -30,11 +98,24 @@ class CourseRepository:
         return new_courses
 
     async def update(self, course_data: List[SCourseCreate]) -> List[Course]:
-        course_titles = [c.title for c in course_data]
-        existing_courses = await self.find(course_titles)
-        existing_titles = {c.title for c in existing_courses}
-        new_course_data = [c for c in course_data if c.title not in existing_titles]
-        new_courses = []
-        if new_course_data:
-            new_courses = await self.create(new_course_data)
-        return existing_courses + new_courses
+        """Находит курсы по названиям, недостающие создаёт; порядок как в запросе."""
+        titles = list(dict.fromkeys(c.title for c in course_data))
+        if not titles:
+            return []
+        # ON CONFLICT вместо "SELECT, потом INSERT": параллельные запросы с тем же
+        # названием не создают дубль, а ждут чужую вставку и пропускают строку
+        now = datetime.now()
+        query = (
+            pg_insert(Course)
+            .values(
+                [{"id": uuid.uuid4(), "title": t, "created_at": now} for t in titles]
+            )
+            .on_conflict_do_nothing(index_elements=[Course.title])
+            .returning(Course)
+        )
+        result = await self.session.execute(query)
+        courses = {course.title: course for course in result.scalars().all()}
+        missing = [title for title in titles if title not in courses]
+        if missing:
+            courses.update((c.title, c) for c in await self.find(missing))
+        return [courses[title] for title in titles]
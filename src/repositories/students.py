@@ -1,15 +1,36 @@
 import uuid
-from typing import List, Optional
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from datetime import datetime
+from typing import AsyncIterator, FrozenSet, List, Optional, Tuple
+from sqlalchemy import Row, delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from src.models.student import Student
+from src.core.batch import any_id
+from src.core.counting import count_rows
+from src.core.enums import CountMode, LoaderStrategy
+from src.core.etag import row_version
+from src.core.filters import RANGE_OPS, TEXT_OPS, FilterField, ListParams, Listing
+from src.core.loading import field_options, load_option, scalars
+from src.core.pagination import split_page
+from src.models.courses import Course
+from src.models.student import Student, student_course
 
 from src.schemas.student import SStudentCreate, SStudentUpdate
 
 
 class StudentRepository:
+    listing = Listing(
+        Student,
+        filters={
+            "name": FilterField(Student.name, TEXT_OPS),
+            "created_at": FilterField(Student.created_at, RANGE_OPS),
+            "updated_at": FilterField(Student.updated_at, RANGE_OPS),
+            # ?course=Python: студенты, записанные на курс, через EXISTS
+            "course": FilterField(Course.title, TEXT_OPS, via=Student.courses),
+        },
+        sorts=("created_at", "name"),
+    )
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -17,33 +38,129 @@ class StudentRepository:
         student, courses = student_data.to_orm_models()
         return student, courses
 
-    async def get_id(self, student_id: uuid.UUID) -> Optional[Student]:
+    async def get_id(
+        self,
+        student_id: uuid.UUID,
+        strategy: LoaderStrategy = LoaderStrategy.JOINED,
+        fields: Optional[FrozenSet[str]] = None,
+    ) -> Optional[Student]:
         query = (
             select(Student)
-            .options(joinedload(Student.courses))
+            .options(*field_options(Student, fields, [Student.courses], strategy))
             .filter_by(id=student_id)
         )
         result = await self.session.execute(query)
-        return result.unique().scalar()
+        rows = scalars(result, strategy)
+        return rows[0] if rows else None
 
-    async def get_all(
-        self, skip: int = 0, limit: int = 100, **filter_by
+    async def get_many(
+        self,
+        ids: List[uuid.UUID],
+        strategy: LoaderStrategy = LoaderStrategy.SELECTIN,
+        fields: Optional[FrozenSet[str]] = None,
     ) -> List[Student]:
+        """Записи по списку id одним запросом; порядок не гарантирован."""
+        query = (
+            select(Student)
+            .options(*field_options(Student, fields, [Student.courses], strategy))
+            .where(any_id(Student.id, ids))
+        )
+        result = await self.session.execute(query)
+        return scalars(result, strategy)
+
+    async def get_all(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        strategy: LoaderStrategy = LoaderStrategy.SELECTIN,
+        fields: Optional[FrozenSet[str]] = None,
+        params: Optional[ListParams] = None,
+        **filter_by,
+    ) -> Tuple[List[Student], Optional[str]]:
+        keys = self.listing.keys(params)
         query = (
             select(Student)
-            .options(joinedload(Student.courses))
+            .options(*field_options(Student, fields, [Student.courses], strategy, keys))
             .filter_by(**filter_by)
-            .offset(skip)
-            .limit(limit)
         )
+        query = self.listing.apply(query, params, limit, cursor)
         result = await self.session.execute(query)
-        return result.unique().scalars().all()
+        return split_page(scalars(result, strategy), keys, limit)
+
+    async def get_version(self, student_id: uuid.UUID) -> Optional[datetime]:
+        return await self.session.scalar(
+            select(row_version(Student)).where(Student.id == student_id)
+        )
+
+    async def get_page_versions(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        params: Optional[ListParams] = None,
+    ) -> List[Row]:
+        """(id, версия) строк страницы get_all, без связей: хватает на ETag."""
+        query = select(Student.id, row_version(Student))
+        query = self.listing.apply(query, params, limit, cursor)
+        return (await self.session.execute(query)).all()
+
+    async def count(
+        self, mode: CountMode, params: Optional[ListParams] = None
+    ) -> Optional[int]:
+        """Всего строк под фильтрами params: оценкой или точно, см. CountMode."""
+        query = self.listing.filtered(select(Student.id), params)
+        return await count_rows(self.session, query, mode)
+
+    async def stream_all(self, chunk_size: int) -> AsyncIterator[List[Student]]:
+        query = (
+            select(Student)
+            .options(load_option(Student.courses, LoaderStrategy.SELECTIN))
+            .order_by(Student.created_at, Student.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.scalars().partitions():
+            yield partition
+
+    async def set_courses(
+        self, student: Student, courses: List[Course], replace: bool = False
+    ) -> None:
+        """Записывает студента на курсы одним INSERT вместо построчного unit of work."""
+        if replace:
+            await self.session.execute(
+                delete(student_course).where(student_course.c.student_id == student.id)
+            )
+        if courses:
+            await self.session.execute(
+                insert(student_course).values(
+                    [{"student_id": student.id, "course_id": c.id} for c in courses]
+                )
+            )
+        # коллекция уже совпадает с базой, flush не должен писать её второй раз
+        set_committed_value(student, "courses", courses)
 
     async def update(
         self, student_id: uuid.UUID, student_data: SStudentUpdate
-    ) -> Student:
+    ) -> Optional[Student]:
         student = await self.get_id(student_id)
+        if student is None:
+            return None
 
         student_data.apply_updates(student)
+        # курсы входят в ответ, их замена тоже новая версия студента
+        student.updated_at = datetime.now()
 
         return student
+
+    async def touch_by_courses(self, course_ids: List[uuid.UUID]) -> List[uuid.UUID]:
+        """Новая версия у студентов этих курсов; возвращает их id."""
+        enrolled = select(student_course.c.student_id).where(
+            student_course.c.course_id.in_(course_ids)
+        )
+        result = await self.session.execute(
+            update(Student)
+            .where(Student.id.in_(enrolled))
+            .values(updated_at=datetime.now())
+            .returning(Student.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalars().all()
@@ -1,14 +1,36 @@
-from typing import List, Optional
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, FrozenSet, List, Optional, Tuple
+import sqlalchemy as sa
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.batch import any_id
+from src.core.counting import count_rows
+from src.core.enums import CountMode, LoaderStrategy
+from src.core.etag import row_version
+from src.core.filters import RANGE_OPS, TEXT_OPS, FilterField, ListParams, Listing
+from src.core.loading import field_options, load_option, scalars
+from src.core.pagination import split_page
+from src.core.search import word_similar, word_similarity
+from src.models.profile import Profile
 from src.models.user import User
 
 from src.schemas.user import SUserCreate, SUserUpdate
 
 
 class UserRepository:
+    listing = Listing(
+        User,
+        filters={
+            "username": FilterField(User.username, TEXT_OPS),
+            "email": FilterField(User.email, TEXT_OPS),
+            "created_at": FilterField(User.created_at, RANGE_OPS),
+            "updated_at": FilterField(User.updated_at, RANGE_OPS),
+        },
+        sorts=("created_at", "username", "email"),
+    )
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -16,23 +38,127 @@ class UserRepository:
         user, profile = user_data.to_orm_models()
         return user, profile
 
-    async def get_id(self, **filter_by) -> Optional[User]:
-        query = select(User).options(joinedload(User.profile)).filter_by(**filter_by)
+    async def get_id(
+        self,
+        strategy: LoaderStrategy = LoaderStrategy.JOINED,
+        fields: Optional[FrozenSet[str]] = None,
+        **filter_by,
+    ) -> Optional[User]:
+        query = (
+            select(User)
+            .options(*field_options(User, fields, [User.profile], strategy))
+            .filter_by(**filter_by)
+        )
+        result = await self.session.execute(query)
+        rows = scalars(result, strategy)
+        return rows[0] if rows else None
+
+    async def get_many(
+        self,
+        ids: List[uuid.UUID],
+        strategy: LoaderStrategy = LoaderStrategy.JOINED,
+        fields: Optional[FrozenSet[str]] = None,
+    ) -> List[User]:
+        """Записи по списку id одним запросом; порядок не гарантирован."""
+        query = (
+            select(User)
+            .options(*field_options(User, fields, [User.profile], strategy))
+            .where(any_id(User.id, ids))
+        )
         result = await self.session.execute(query)
-        return result.unique().scalar()
+        return scalars(result, strategy)
 
-    async def get_all(self, skip: int = 0, limit: int = 100, **filter_by) -> List[User]:
+    async def get_all(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        strategy: LoaderStrategy = LoaderStrategy.JOINED,
+        fields: Optional[FrozenSet[str]] = None,
+        params: Optional[ListParams] = None,
+        **filter_by,
+    ) -> Tuple[List[User], Optional[str]]:
+        # профиль один к одному, joinedload тут не размножает строки
+        keys = self.listing.keys(params)
         query = (
             select(User)
-            .options(joinedload(User.profile))
+            .options(*field_options(User, fields, [User.profile], strategy, keys))
             .filter_by(**filter_by)
-            .offset(skip)
-            .limit(limit)
         )
+        query = self.listing.apply(query, params, limit, cursor)
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return split_page(scalars(result, strategy), keys, limit)
+
+    async def get_version(self, user_id: uuid.UUID) -> Optional[datetime]:
+        return await self.session.scalar(
+            select(row_version(User)).where(User.id == user_id)
+        )
+
+    async def get_page_versions(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        params: Optional[ListParams] = None,
+    ) -> List[Row]:
+        """(id, версия) строк страницы get_all, без связей: хватает на ETag."""
+        query = select(User.id, row_version(User))
+        query = self.listing.apply(query, params, limit, cursor)
+        return (await self.session.execute(query)).all()
+
+    async def count(
+        self, mode: CountMode, params: Optional[ListParams] = None
+    ) -> Optional[int]:
+        """Всего строк под фильтрами params: оценкой или точно, см. CountMode."""
+        query = self.listing.filtered(select(User.id), params)
+        return await count_rows(self.session, query, mode)
+
+    async def search(self, text: str, limit: int = 10) -> List[Tuple[User, float]]:
+        """Top-K пользователей, похожих на text по логину, почте или имени."""
+        # по подзапросу на колонку: каждый идёт по своему trigram-индексу,
+        # OR по колонкам разных таблиц индекс бы не использовал
+        candidates = [(User.id, User.username), (User.id, User.email)] + [
+            (Profile.user_id, column)
+            for column in (Profile.first_name, Profile.last_name)
+        ]
+        hits = sa.union_all(
+            *(
+                select(
+                    key.label("user_id"),
+                    word_similarity(text, column).label("score"),
+                ).where(word_similar(text, column))
+                for key, column in candidates
+            )
+        ).subquery()
+        ranked = (
+            select(hits.c.user_id, sa.func.max(hits.c.score).label("score"))
+            .group_by(hits.c.user_id)
+            .order_by(sa.desc("score"), hits.c.user_id)
+            .limit(limit)
+            .subquery()
+        )
+        statement = (
+            select(User, ranked.c.score)
+            .join(ranked, ranked.c.user_id == User.id)
+            .options(load_option(User.profile, LoaderStrategy.JOINED))
+            .order_by(ranked.c.score.desc(), User.id)
+        )
+        return [tuple(row) for row in (await self.session.execute(statement)).all()]
+
+    async def stream_all(self, chunk_size: int) -> AsyncIterator[List[User]]:
+        query = (
+            select(User)
+            .options(load_option(User.profile, LoaderStrategy.JOINED))
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for partition in result.scalars().partitions():
+            yield partition
 
-    async def update(self, user_id: int, user_data: SUserUpdate) -> User:
+    async def update(self, user_id: int, user_data: SUserUpdate) -> Optional[User]:
         user = await self.get_id(id=user_id)
+        if user is None:
+            return None
         user_data.apply_to_user(user)
+        # профиль входит в ответ, его изменение - новая версия пользователя
+        user.updated_at = datetime.now()
         return user
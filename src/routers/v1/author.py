@@ -1,53 +1,176 @@
 import uuid
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Optional, Union
 
-from src.core.enums import Status
-from src.schemas.author import SAuthorCreate, SAuthorRead, SAuthorUpdate
+from src.core.counting import COUNT_DESCRIPTION, counted_etag, with_total
+from src.core.enums import CountMode, Status
+from src.core.etag import entity_etag, etag_matches, not_modified, with_etag
+from src.core.fields import FIELDS_DESCRIPTION, parse_fields
+from src.core.filters import ListParams, list_params
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.schemas.author import (
+    SAuthorBulkResult,
+    SAuthorCreate,
+    SAuthorRead,
+    SAuthorSearchHit,
+    SAuthorUpdate,
+)
+from src.schemas.batch import SBatch, SBatchGet
+from src.schemas.pagination import SPage
 from src.service.author import (
+    author_version,
+    authors_page_etag,
+    bulk_create_authors,
     create_author_with_books,
     find_one_or_none_by_id,
+    export_authors,
     find_all_authors,
+    search_authors,
+    find_many_authors,
     update_author_with_books,
     delete_author,
 )
 
-from src.core.db import get_async_session
+from src.core.db import get_async_session, get_read_session, settings
+from src.core.responses import ModelResponse, NDJSONResponse
 
 router = APIRouter(prefix="/api/v1/authors_books", tags=["author"])
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=SAuthorRead)
 async def create_author(
     payload: SAuthorCreate, session: AsyncSession = Depends(get_async_session)
-) -> SAuthorRead:
-    return await create_author_with_books(session=session, data=payload)
+) -> ModelResponse:
+    return ModelResponse(
+        await create_author_with_books(session=session, data=payload),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post(
+    "/bulk", status_code=status.HTTP_201_CREATED, response_model=SAuthorBulkResult
+)
+async def create_authors_bulk(
+    payload: List[Dict[str, Any]], session: AsyncSession = Depends(get_async_session)
+) -> ModelResponse:
+    # элементы валидируются поштучно в сервисе, чтобы вернуть ошибки по каждому
+    return ModelResponse(
+        await bulk_create_authors(session=session, payload=payload),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+@router.post(
+    "/batch-get", status_code=status.HTTP_200_OK, response_model=SBatch[SAuthorRead]
+)
+async def batch_get_authors(
+    payload: SBatchGet,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
+) -> ModelResponse:
+    """Записи по списку id одним запросом, в порядке ids; null - записи нет."""
+    selected = parse_fields(fields, SAuthorRead)
+    return ModelResponse(
+        await find_many_authors(session=session, ids=payload.ids, fields=selected)
+    )
+
+
+@router.get("/", status_code=status.HTTP_200_OK, response_model=SPage[SAuthorRead])
 async def find_all(
-    session: AsyncSession = Depends(get_async_session),
-) -> List[SAuthorRead]:
-    return await find_all_authors(session=session)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    params: ListParams = Depends(list_params),
+    count: CountMode = Query(CountMode.NONE, description=COUNT_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    selected = parse_fields(fields, SAuthorRead)
+    # сначала дешёвая проверка версии: совпала - ни книг, ни сериализации
+    etag = await authors_page_etag(
+        session=session, limit=limit, cursor=cursor, params=params
+    )
+    # с count ETag зависит и от total, он известен только после страницы
+    if count is CountMode.NONE and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    page = await find_all_authors(
+        session=session,
+        limit=limit,
+        cursor=cursor,
+        fields=selected,
+        params=params,
+        count=count,
+    )
+    etag = counted_etag(etag, count, page.total)
+    if count is not CountMode.NONE and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(with_total(ModelResponse(page), page.total), etag)
+
+
+@router.get(
+    "/search", status_code=status.HTTP_200_OK, response_model=SPage[SAuthorSearchHit]
+)
+async def search(
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description='Слова из имени автора или названий книг: "фраза", or, -слово',
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor"),
+    session: AsyncSession = Depends(get_read_session),
+) -> ModelResponse:
+    return ModelResponse(
+        await search_authors(session=session, text=q, limit=limit, cursor=cursor)
+    )
 
 
-@router.get("/{id}", status_code=status.HTTP_206_PARTIAL_CONTENT)
+@router.get("/export", response_class=NDJSONResponse)
+async def export_all() -> NDJSONResponse:
+    """Все авторы с книгами потоком NDJSON, по одному объекту на строку."""
+    return NDJSONResponse(export_authors(settings.export_chunk_size))
+
+
+@router.get(
+    "/{id}", status_code=status.HTTP_206_PARTIAL_CONTENT, response_model=SAuthorRead
+)
 async def find_author_is_id(
-    id: uuid.UUID, session: AsyncSession = Depends(get_async_session)
-) -> SAuthorRead:
-    return await find_one_or_none_by_id(session=session, id=id)
+    id: uuid.UUID,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    selected = parse_fields(fields, SAuthorRead)
+    # тело отдаётся той же версии, по которой ETag (см. EntityCache.get)
+    version = await author_version(session=session, author_id=id)
+    etag = entity_etag(id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(
+        ModelResponse(
+            await find_one_or_none_by_id(
+                session=session, id=id, fields=selected, version=version
+            ),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+        ),
+        etag,
+    )
 
 
-@router.put("/{id}", status_code=status.HTTP_201_CREATED)
+@router.put("/{id}", status_code=status.HTTP_201_CREATED, response_model=SAuthorRead)
 async def update(
     id: uuid.UUID,
     payload: SAuthorUpdate,
     session: AsyncSession = Depends(get_async_session),
-) -> SAuthorRead:
-    return await update_author_with_books(
-        session=session, author_id=id, author_data=payload
+) -> ModelResponse:
+    return ModelResponse(
+        await update_author_with_books(
+            session=session, author_id=id, author_data=payload
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
@@ -1,45 +1,105 @@
 import uuid
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from fastapi.responses import Response
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.counting import COUNT_DESCRIPTION, counted_etag, with_total
+from src.core.enums import CountMode
+from src.core.etag import etag_matches, not_modified, with_etag
+from src.core.fields import FIELDS_DESCRIPTION, parse_fields
+from src.core.filters import ListParams, list_params
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from src.schemas.courses import SCourseCreate, SCourseRead
+from src.schemas.pagination import SPage
 from src.service.courses import (
+    course_etag,
+    courses_page_etag,
     create_new_courses,
+    export_courses,
     find_all_courses,
     find_existing_courses,
     update_courses,
     delete_courses,
 )
 
-from src.core.db import get_async_session
-
+from src.core.db import get_async_session, get_read_session, settings
+from src.core.responses import ModelResponse, NDJSONResponse
 
 router = APIRouter(prefix="/api/v1/courses", tags=["courses"])
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+@router.get("/", status_code=status.HTTP_200_OK, response_model=SPage[SCourseRead])
 async def get_all_courses(
-    session: AsyncSession = Depends(get_async_session),
-) -> List[SCourseRead]:
-    return await find_all_courses(session=session)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    params: ListParams = Depends(list_params),
+    count: CountMode = Query(CountMode.NONE, description=COUNT_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    selected = parse_fields(fields, SCourseRead)
+    etag = await courses_page_etag(
+        session=session, limit=limit, cursor=cursor, params=params
+    )
+    # с count ETag зависит и от total, он известен только после страницы
+    if count is CountMode.NONE and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    page = await find_all_courses(
+        session=session,
+        limit=limit,
+        cursor=cursor,
+        fields=selected,
+        params=params,
+        count=count,
+    )
+    etag = counted_etag(etag, count, page.total)
+    if count is not CountMode.NONE and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(with_total(ModelResponse(page), page.total), etag)
+
 
+@router.get("/export", response_class=NDJSONResponse)
+async def export_all_courses() -> NDJSONResponse:
+    """Все курсы потоком NDJSON."""
+    return NDJSONResponse(export_courses(settings.export_chunk_size))
 
-@router.get("/{id}", status_code=status.HTTP_206_PARTIAL_CONTENT)
+
+@router.get(
+    "/{id}", status_code=status.HTTP_206_PARTIAL_CONTENT, response_model=SCourseRead
+)
 async def get_course_by_id(
-    id: uuid.UUID, session: AsyncSession = Depends(get_async_session)
-) -> SCourseRead:
-    return await find_existing_courses(session=session, course_titles=[id])
+    id: uuid.UUID,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    selected = parse_fields(fields, SCourseRead)
+    etag = await course_etag(session=session, course_id=id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(
+        ModelResponse(
+            await find_existing_courses(
+                session=session, course_titles=[id], fields=selected
+            ),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+        ),
+        etag,
+    )
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=List[SCourseRead])
 async def created_courses(
     payload: List[SCourseCreate], session: AsyncSession = Depends(get_async_session)
-) -> List[SCourseRead]:
-    return await create_new_courses(session=session, new_course_data=payload)
+) -> ModelResponse:
+    return ModelResponse(
+        await create_new_courses(session=session, new_course_data=payload),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.delete("/{name}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,34 @@
+import os
+
+from fastapi import APIRouter, Response, status
+
+from src.core.cache import cache_backend
+from src.core.db import get_engine
+from src.core.metrics import render_metrics
+from src.core.pool import engine_pool_stats
+from src.schemas.monitoring import SCacheStats, SPoolStats
+
+router = APIRouter(prefix="/api/v1/monitoring", tags=["monitoring"])
+# Prometheus ждёт /metrics в корне, без версии API
+metrics_router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def get_pool_stats() -> SPoolStats:
+    return SPoolStats(**engine_pool_stats(get_engine()))
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+async def get_cache_stats() -> SCacheStats:
+    return SCacheStats(
+        pid=os.getpid(),
+        backend=type(cache_backend).__name__,
+        entries=cache_backend.size(),
+        **cache_backend.stats.as_dict(),
+    )
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
@@ -1,54 +1,134 @@
 import uuid
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from src.core.enums import Status
+from src.core.counting import COUNT_DESCRIPTION, counted_etag, with_total
+from src.core.enums import CountMode
+from src.core.etag import entity_etag, etag_matches, not_modified, with_etag
+from src.core.fields import FIELDS_DESCRIPTION, parse_fields
+from src.core.filters import ListParams, list_params
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.schemas.batch import SBatch, SBatchGet
+from src.schemas.pagination import SPage
 from src.schemas.student import SStudentCreate, SStudentRead, SStudentUpdate
 from src.service.student import (
     add_student,
+    export_students,
     find_all_students,
     find_one_with_id,
+    student_version,
+    students_page_etag,
+    find_many_students,
     update_student_with_course,
     delete_student,
 )
 
-from src.core.db import get_async_session
-
+from src.core.db import get_async_session, get_read_session, settings
+from src.core.responses import ModelResponse, NDJSONResponse
 
 router = APIRouter(prefix="/api/v1/students_courses", tags=["student"])
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=SStudentRead)
 async def created_student(
     payload: SStudentCreate, session: AsyncSession = Depends(get_async_session)
-) -> SStudentRead:
-    return await add_student(session=session, student_data=payload)
+) -> ModelResponse:
+    return ModelResponse(
+        await add_student(session=session, student_data=payload),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post(
+    "/batch-get", status_code=status.HTTP_200_OK, response_model=SBatch[SStudentRead]
+)
+async def batch_get_students(
+    payload: SBatchGet,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
+) -> ModelResponse:
+    """Записи по списку id одним запросом, в порядке ids; null - записи нет."""
+    selected = parse_fields(fields, SStudentRead)
+    return ModelResponse(
+        await find_many_students(session=session, ids=payload.ids, fields=selected)
+    )
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+@router.get("/", status_code=status.HTTP_200_OK, response_model=SPage[SStudentRead])
 async def get_all_students(
-    session: AsyncSession = Depends(get_async_session),
-) -> List[SStudentRead]:
-    return await find_all_students(session=session)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    params: ListParams = Depends(list_params),
+    count: CountMode = Query(CountMode.NONE, description=COUNT_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    selected = parse_fields(fields, SStudentRead)
+    etag = await students_page_etag(
+        session=session, limit=limit, cursor=cursor, params=params
+    )
+    # с count ETag зависит и от total, он известен только после страницы
+    if count is CountMode.NONE and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    page = await find_all_students(
+        session=session,
+        limit=limit,
+        cursor=cursor,
+        fields=selected,
+        params=params,
+        count=count,
+    )
+    etag = counted_etag(etag, count, page.total)
+    if count is not CountMode.NONE and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(with_total(ModelResponse(page), page.total), etag)
+
 
+@router.get("/export", response_class=NDJSONResponse)
+async def export_all_students() -> NDJSONResponse:
+    """Все студенты с курсами потоком NDJSON."""
+    return NDJSONResponse(export_students(settings.export_chunk_size))
 
-@router.get("/{id}", status_code=status.HTTP_206_PARTIAL_CONTENT)
+
+@router.get(
+    "/{id}", status_code=status.HTTP_206_PARTIAL_CONTENT, response_model=SStudentRead
+)
 async def get_student_by_id(
-    id: uuid.UUID, session: AsyncSession = Depends(get_async_session)
-) -> SStudentRead:
-    return await find_one_with_id(session=session, student_id=id)
+    id: uuid.UUID,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    selected = parse_fields(fields, SStudentRead)
+    version = await student_version(session=session, student_id=id)
+    etag = entity_etag(id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(
+        ModelResponse(
+            await find_one_with_id(
+                session=session, student_id=id, fields=selected, version=version
+            ),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+        ),
+        etag,
+    )
 
 
-@router.put("/{id}", status_code=status.HTTP_201_CREATED)
+@router.put("/{id}", status_code=status.HTTP_201_CREATED, response_model=SStudentRead)
 async def update_student(
     id: uuid.UUID,
     payload: SStudentUpdate,
     session: AsyncSession = Depends(get_async_session),
-) -> SStudentRead:
-    return await update_student_with_course(
-        session=session, student_id=id, student_data=payload
+) -> ModelResponse:
+    return ModelResponse(
+        await update_student_with_course(
+            session=session, student_id=id, student_data=payload
+        ),
+        status_code=status.HTTP_201_CREATED,
     )
 
 
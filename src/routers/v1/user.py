@@ -1,53 +1,145 @@
 import uuid
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from src.core.enums import Status
-from src.schemas.user import SUserRead, SUserCreate, SUserUpdate
+from src.core.counting import COUNT_DESCRIPTION, counted_etag, with_total
+from src.core.enums import CountMode, Status
+from src.core.etag import entity_etag, etag_matches, not_modified, with_etag
+from src.core.fields import FIELDS_DESCRIPTION, parse_fields
+from src.core.filters import ListParams, list_params
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.schemas.batch import SBatch, SBatchGet
+from src.schemas.pagination import SPage
+from src.schemas.user import SUserRead, SUserCreate, SUserSearchHit, SUserUpdate
 from src.service.user import (
     create_user_with_profile,
     find_one_or_none_with_profile,
+    export_users,
     find_all_with_profiles,
+    search_users,
+    find_many_users,
     update_user,
+    user_version,
+    users_page_etag,
     delete_user,
 )
 
-from src.core.db import get_async_session
-
+from src.core.db import get_async_session, get_read_session, settings
+from src.core.responses import ModelResponse, NDJSONResponse
 
 router = APIRouter(prefix="/api/v1/users_profiles", tags=["user"])
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+@router.post(
+    "/batch-get", status_code=status.HTTP_200_OK, response_model=SBatch[SUserRead]
+)
+async def batch_get_users(
+    payload: SBatchGet,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
+) -> ModelResponse:
+    """Записи по списку id одним запросом, в порядке ids; null - записи нет."""
+    selected = parse_fields(fields, SUserRead)
+    return ModelResponse(
+        await find_many_users(session=session, ids=payload.ids, fields=selected)
+    )
+
+
+@router.get("/", status_code=status.HTTP_200_OK, response_model=SPage[SUserRead])
 async def find_all_users(
-    session: AsyncSession = Depends(get_async_session),
-) -> List[SUserRead]:
-    return await find_all_with_profiles(session=session)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Курсор из next_cursor"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    params: ListParams = Depends(list_params),
+    count: CountMode = Query(CountMode.NONE, description=COUNT_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    selected = parse_fields(fields, SUserRead)
+    etag = await users_page_etag(
+        session=session, limit=limit, cursor=cursor, params=params
+    )
+    # с count ETag зависит и от total, он известен только после страницы
+    if count is CountMode.NONE and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    page = await find_all_with_profiles(
+        session=session,
+        limit=limit,
+        cursor=cursor,
+        fields=selected,
+        params=params,
+        count=count,
+    )
+    etag = counted_etag(etag, count, page.total)
+    if count is not CountMode.NONE and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(with_total(ModelResponse(page), page.total), etag)
+
 
+@router.get(
+    "/search", status_code=status.HTTP_200_OK, response_model=List[SUserSearchHit]
+)
+async def search_users_fuzzy(
+    q: str = Query(
+        ...,
+        min_length=3,
+        max_length=100,
+        description="Часть логина, почты, имени или фамилии; опечатки допустимы",
+    ),
+    limit: int = Query(10, ge=1, le=50, description="Сколько лучших совпадений"),
+    session: AsyncSession = Depends(get_read_session),
+) -> ModelResponse:
+    # меньше трёх символов - ни одной целой триграммы, индекс не поможет
+    return ModelResponse(await search_users(session=session, text=q, limit=limit))
+
+
+@router.get("/export", response_class=NDJSONResponse)
+async def export_all_users() -> NDJSONResponse:
+    """Все пользователи с профилями потоком NDJSON."""
+    return NDJSONResponse(export_users(settings.export_chunk_size))
 
-@router.get("/{id}", status_code=status.HTTP_200_OK)
+
+@router.get("/{id}", status_code=status.HTTP_200_OK, response_model=SUserRead)
 async def find_user_is_id(
-    id: uuid.UUID, session: AsyncSession = Depends(get_async_session)
-) -> SUserRead:
-    return await find_one_or_none_with_profile(session=session, id=id)
+    id: uuid.UUID,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> Response:
+    selected = parse_fields(fields, SUserRead)
+    version = await user_version(session=session, user_id=id)
+    etag = entity_etag(id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return with_etag(
+        ModelResponse(
+            await find_one_or_none_with_profile(
+                session=session, id=id, fields=selected, version=version
+            )
+        ),
+        etag,
+    )
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=SUserRead)
 async def add_user_with_profile(
     payload: SUserCreate, session: AsyncSession = Depends(get_async_session)
-) -> SUserRead:
-    return await create_user_with_profile(session=session, user_data=payload)
+) -> ModelResponse:
+    return ModelResponse(
+        await create_user_with_profile(session=session, user_data=payload),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
-@router.put("/{id}", status_code=status.HTTP_200_OK)
+@router.put("/{id}", status_code=status.HTTP_200_OK, response_model=SUserRead)
 async def update_user_profile(
     id: uuid.UUID,
     payload: SUserUpdate,
     session: AsyncSession = Depends(get_async_session),
-) -> SUserRead:
-    return await update_user(session=session, user_id=id, data=payload)
+) -> ModelResponse:
+    return ModelResponse(await update_user(session=session, user_id=id, data=payload))
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -8,7 +8,7 @@ from pydantic import (
     field_validator,
     model_validator,
 )
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict
 
 from src.models.author import Author
 from src.models.books import Book
@@ -113,3 +113,23 @@ class SAuthorRead(BaseModel):
     books: List[SBookRead]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SAuthorSearchHit(SAuthorRead):
+    rank: float = Field(..., description="Релевантность: имя автора весит больше книг")
+
+
+class SBulkItemError(BaseModel):
+    index: int = Field(..., description="Позиция элемента во входном списке")
+    message: str = Field(..., description="Сообщение об ошибке")
+    context: Dict[str, Any] = Field(default_factory=dict)
+
+
+class SAuthorBulkCreated(BaseModel):
+    index: int = Field(..., description="Позиция элемента во входном списке")
+    id: uuid.UUID = Field(..., description="ID созданного автора")
+
+
+class SAuthorBulkResult(BaseModel):
+    created: List[SAuthorBulkCreated]
+    errors: List[SBulkItemError]
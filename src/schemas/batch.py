@@ -0,0 +1,28 @@
+import uuid
+from pydantic import BaseModel, Field
+from typing import Dict, Generic, List, Optional, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SBatchGet(BaseModel):
+    ids: List[uuid.UUID] = Field(
+        ..., min_length=1, description="id записей; порядок ответа такой же"
+    )
+
+
+class SBatch(BaseModel, Generic[T]):
+    items: List[Optional[T]] = Field(
+        ..., description="Записи в порядке ids запроса, null - записи нет"
+    )
+    missing: List[uuid.UUID] = Field(
+        default_factory=list, description="id из запроса, которых нет в базе"
+    )
+
+    @classmethod
+    def ordered(cls, ids: Sequence[uuid.UUID], found: Dict[uuid.UUID, T]) -> "SBatch":
+        return cls(
+            items=[found.get(id) for id in ids],
+            missing=[id for id in dict.fromkeys(ids) if id not in found],
+        )
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class SPoolStats(BaseModel):
+    pid: int = Field(..., description="PID воркера, к которому относится пул")
+    size: int = Field(..., description="Постоянный размер пула")
+    checked_in: int = Field(..., description="Свободные соединения в пуле")
+    checked_out: int = Field(..., description="Соединения, выданные запросам")
+    overflow: int = Field(..., description="Открытые сверх pool_size соединения")
+    max_overflow: int
+    checkouts: int = Field(..., description="Всего выдач соединения")
+    timeouts: int = Field(..., description="Таймауты ожидания соединения")
+    wait_avg_ms: float = Field(..., description="Среднее ожидание соединения")
+    wait_max_ms: float = Field(..., description="Максимальное ожидание соединения")
+    connects: int = Field(..., description="Открыто новых соединений")
+    connect_avg_ms: float = Field(..., description="Среднее время открытия соединения")
+
+
+class SCacheStats(BaseModel):
+    pid: int = Field(..., description="PID воркера")
+    backend: str = Field(..., description="Класс бэкенда кэша")
+    entries: Optional[int] = Field(None, description="Записей в кэше, если известно")
+    hits: int
+    misses: int
+    evictions: int = Field(..., description="Вытеснено по лимиту размера")
+    expirations: int = Field(..., description="Удалено по истечении TTL")
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SPage(BaseModel, Generic[T]):
+    items: List[T] = Field(..., description="Записи текущей страницы")
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы, null если страница последняя"
+    )
+    total: Optional[int] = Field(
+        None,
+        description="Всего записей с учётом фильтров; null, если count=none, "
+        "и приблизительно при count=estimate",
+    )
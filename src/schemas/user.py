@@ -98,3 +98,7 @@ class SUserRead(BaseModel):
     profile: SProfileRead
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SUserSearchHit(SUserRead):
+    score: float = Field(..., description="Сходство с запросом (word_similarity), 0..1")
@@ -1,17 +1,41 @@
 import uuid
 import logging
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Tuple
 
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.schemas.author import SAuthorCreate, SAuthorRead, SAuthorUpdate
+from src.core.batch import load_many
+from src.core.cache import entity_cache
+from src.core.db import async_session_maker, settings
+from src.core.enums import CountMode, LoaderStrategy
+from src.core.etag import page_etag, version_of
+from src.core.fields import read_schema
+from src.core.filters import ListParams
+from src.core.responses import ndjson_lines
+from src.schemas.author import (
+    SAuthorBulkCreated,
+    SAuthorBulkResult,
+    SAuthorCreate,
+    SAuthorRead,
+    SAuthorSearchHit,
+    SAuthorUpdate,
+    SBulkItemError,
+)
+from src.schemas.batch import SBatch
+from src.schemas.pagination import SPage
 
 from src.repositories.author import AuthorRepository as rep_author
 
+from src.exception.base import BaseHTTPException
 from src.exception.client_exception import ValidationError, NotFoundError
 
 logger = logging.getLogger(__name__)
 
+author_cache = entity_cache("author", SAuthorRead)
+
 
 async def create_author_with_books(
     session: AsyncSession, data: SAuthorCreate
@@ -27,24 +51,184 @@ async def create_author_with_books(
     return SAuthorRead.model_validate(author, from_attributes=True)
 
 
-async def find_one_or_none_by_id(session: AsyncSession, id: uuid.UUID) -> SAuthorRead:
-    author = await rep_author(session).get_id(id=id)
+def _validate_bulk_item(
+    index: int, item: Dict[str, Any]
+) -> Tuple[Optional[SAuthorCreate], Optional[SBulkItemError]]:
+    try:
+        return SAuthorCreate.model_validate(item), None
+    except PydanticValidationError as e:
+        message = "; ".join(
+            f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+            for err in e.errors()
+        )
+        return None, SBulkItemError(index=index, message=message)
+    except BaseHTTPException as e:
+        # кастомные валидаторы схемы бросают HTTP-исключения, а не ValueError;
+        # ValidationError передаёт своё сообщение в context["tail"], а detail
+        # остаётся общим "Неверный запрос"
+        context = dict(e.context)
+        message = context.pop("tail", None) or e.detail.message
+        context.pop("status_code", None)
+        context.update(context.pop("context", None) or {})
+        return None, SBulkItemError(index=index, message=message, context=context)
+
+
+async def bulk_create_authors(
+    session: AsyncSession, payload: List[Dict[str, Any]]
+) -> SAuthorBulkResult:
+    errors: List[SBulkItemError] = []
+    valid: List[Tuple[int, SAuthorCreate]] = []
+    for index, item in enumerate(payload):
+        author, error = _validate_bulk_item(index, item)
+        if error:
+            errors.append(error)
+        else:
+            valid.append((index, author))
+
+    repository = rep_author(session)
+    chunk_size = settings.bulk_chunk_size
+    created: List[SAuthorBulkCreated] = []
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start : start + chunk_size]
+        try:
+            async with session.begin_nested():
+                ids = await repository.bulk_create([a for _, a in chunk])
+            created.extend(
+                SAuthorBulkCreated(index=index, id=author_id)
+                for (index, _), author_id in zip(chunk, ids)
+            )
+            continue
+        except DBAPIError as e:
+            logger.warning(
+                f"Чанк авторов {start}-{start + len(chunk)} не вставлен, "
+                f"ищем сбойные записи по одной: {e.orig}"
+            )
+        # медленный путь только для сбойного чанка, остальные идут пачками
+        for index, author in chunk:
+            try:
+                async with session.begin_nested():
+                    ids = await repository.bulk_create([author])
+                created.append(SAuthorBulkCreated(index=index, id=ids[0]))
+            except DBAPIError as e:
+                errors.append(SBulkItemError(index=index, message=str(e.orig)))
+
+    errors.sort(key=lambda error: error.index)
+    return SAuthorBulkResult(created=created, errors=errors)
+
+
+async def find_one_or_none_by_id(
+    session: AsyncSession,
+    id: uuid.UUID,
+    strategy: LoaderStrategy = LoaderStrategy.JOINED,
+    fields: Optional[FrozenSet[str]] = None,
+    version: Optional[datetime] = None,
+) -> SAuthorRead:
+    schema = read_schema(SAuthorRead, fields)
+    # без книг (noload) ответ неполный, такой в кэш не кладём
+    use_cache = strategy is not LoaderStrategy.NOLOAD
+    if use_cache:
+        # version - из ETag: из кэша только запись той же версии
+        cached = await author_cache.get(id, version)
+        if cached is not None:
+            # в кэше полная запись, урезаем её без похода в базу
+            return schema.model_validate(cached, from_attributes=True)
+
+    author = await rep_author(session).get_id(strategy, fields, id=id)
     if not author:
         logger.error(f"Ошибка при поиске записи в базе данных")
         raise NotFoundError(detail=f"Автор с id {id} не найден")
-    return SAuthorRead.model_validate(author, from_attributes=True)
+    result = schema.model_validate(author, from_attributes=True)
+    if use_cache and fields is None:
+        await author_cache.set(session, id, result, version_of(author))
+    return result
+
+
+async def find_many_authors(
+    session: AsyncSession,
+    ids: List[uuid.UUID],
+    fields: Optional[FrozenSet[str]] = None,
+) -> SBatch[SAuthorRead]:
+    schema = read_schema(SAuthorRead, fields)
+    found = await load_many(
+        session,
+        ids,
+        author_cache,
+        schema,
+        fields,
+        lambda missing: rep_author(session).get_many(missing, fields=fields),
+    )
+    return SBatch[schema].ordered(ids, found)
 
 
 async def find_all_authors(
-    session: AsyncSession, skip: int = 0, limit: int = 100, **filter_by
-) -> List[SAuthorRead]:
-    authors = await rep_author(session).get_all(skip, limit, **filter_by)
+    session: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    strategy: LoaderStrategy = LoaderStrategy.SELECTIN,
+    fields: Optional[FrozenSet[str]] = None,
+    params: Optional[ListParams] = None,
+    count: CountMode = CountMode.NONE,
+    **filter_by,
+) -> SPage[SAuthorRead]:
+    authors, next_cursor = await rep_author(session).get_all(
+        limit, cursor, strategy, fields, params, **filter_by
+    )
+    schema = read_schema(SAuthorRead, fields)
     if not authors:
         logger.warning(
             f"Авторы с параметрами {filter_by} не найдены, возвращен пустой список."
         )
         raise NotFoundError(detail=f"Авторы с параметрами {filter_by} не найдены")
-    return [SAuthorRead.model_validate(rec, from_attributes=True) for rec in authors]
+    total = await rep_author(session).count(count, params)
+    return SPage[schema](
+        items=[schema.model_validate(rec, from_attributes=True) for rec in authors],
+        next_cursor=next_cursor,
+        total=total,
+    )
+
+
+async def author_version(
+    session: AsyncSession, author_id: uuid.UUID
+) -> Optional[datetime]:
+    """Версия строки для ETag: один SELECT без связей и без сериализации."""
+    return await rep_author(session).get_version(author_id)
+
+
+async def authors_page_etag(
+    session: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    params: Optional[ListParams] = None,
+) -> Optional[str]:
+    rows = await rep_author(session).get_page_versions(limit, cursor, params)
+    return page_etag(rows, limit) if rows else None
+
+
+async def search_authors(
+    session: AsyncSession, text: str, limit: int = 100, cursor: Optional[str] = None
+) -> SPage[SAuthorSearchHit]:
+    hits, next_cursor = await rep_author(session).search(text, limit, cursor)
+    # пустой результат поиска - обычный ответ, а не 404
+    return SPage[SAuthorSearchHit](
+        items=[
+            SAuthorSearchHit(
+                id=author.id, name=author.name, books=author.books, rank=rank
+            )
+            for author, rank in hits
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+async def export_authors(chunk_size: int) -> AsyncIterator[bytes]:
+    # своя сессия: сессия из Depends закрывается раньше, чем уйдёт тело ответа;
+    # identity map держит объекты по слабым ссылкам, отданные чанки не копятся
+    async with async_session_maker() as session:
+        async for chunk in rep_author(session).stream_all(chunk_size):
+            yield ndjson_lines(
+                SAuthorRead.model_validate(author, from_attributes=True)
+                for author in chunk
+            )
 
 
 async def update_author_with_books(
@@ -57,12 +241,15 @@ async def update_author_with_books(
 
     await session.flush()
     await session.refresh(author, ["books"])
+    await author_cache.invalidate(session, author_id)
     return SAuthorRead.model_validate(author, from_attributes=True)
 
 
 async def delete_author(session: AsyncSession, author_id: uuid.UUID):
-    author = await rep_author(session).get_id(id=author_id)
+    # книги удалит ON DELETE CASCADE (passive_deletes), загружать их незачем
+    author = await rep_author(session).get_id(LoaderStrategy.NOLOAD, id=author_id)
     if not author:
         logger.error(f"Ошибка при удалении записи из базы данных")
         raise NotFoundError(detail=f"Автор с id {author_id} не найден")
     await session.delete(author)
+    await author_cache.invalidate(session, author_id)
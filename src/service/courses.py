@@ -1,47 +1,105 @@
 import logging
-from typing import List
+import uuid
+from typing import AsyncIterator, FrozenSet, List, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.db import async_session_maker
+from src.core.enums import CountMode
+from src.core.etag import make_etag, page_etag
+from src.core.fields import read_schema
+from src.core.filters import ListParams
+from src.core.responses import ndjson_lines
 from src.schemas.courses import SCourseCreate, SCourseRead
+from src.schemas.pagination import SPage
 
 from src.repositories.course import CourseRepository as rep
+from src.repositories.students import StudentRepository as rep_student
+from src.service.student import student_cache
 
-from src.exception.client_exception import BadRequestError, NotFoundError
+from src.exception.client_exception import (
+    BadRequestError,
+    ConflictError,
+    NotFoundError,
+)
 
 logger = logging.getLogger(__name__)
 
 
 async def find_all_courses(
-    session: AsyncSession, skip: int = 0, limit: int = 100
-) -> List[SCourseRead]:
-    course_orm = await rep(session).get_all(skip, limit)
+    session: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[FrozenSet[str]] = None,
+    params: Optional[ListParams] = None,
+    count: CountMode = CountMode.NONE,
+) -> SPage[SCourseRead]:
+    course_orm, next_cursor = await rep(session).get_all(limit, cursor, fields, params)
+    schema = read_schema(SCourseRead, fields)
+    total = await rep(session).count(count, params)
     if not course_orm:
         logger.warning("Курсы не найдены, возвращен пустой список.")
-        return []
-    return [
-        SCourseRead.model_validate(course, from_attributes=True)
-        for course in course_orm
-    ]
+        return SPage[schema](items=[], total=total)
+    return SPage[schema](
+        items=[
+            schema.model_validate(course, from_attributes=True) for course in course_orm
+        ],
+        next_cursor=next_cursor,
+        total=total,
+    )
+
+
+async def course_etag(session: AsyncSession, course_id: uuid.UUID) -> Optional[str]:
+    version = await rep(session).get_version(course_id)
+    return make_etag(course_id, version) if version else None
+
+
+async def courses_page_etag(
+    session: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    params: Optional[ListParams] = None,
+) -> Optional[str]:
+    rows = await rep(session).get_page_versions(limit, cursor, params)
+    return page_etag(rows, limit) if rows else None
+
+
+async def export_courses(chunk_size: int) -> AsyncIterator[bytes]:
+    async with async_session_maker() as session:
+        async for chunk in rep(session).stream_all(chunk_size):
+            yield ndjson_lines(
+                SCourseRead.model_validate(course, from_attributes=True)
+                for course in chunk
+            )
 
 
 async def find_existing_courses(
-    session: AsyncSession, course_titles: List[str]
+    session: AsyncSession,
+    course_titles: List[str],
+    fields: Optional[FrozenSet[str]] = None,
 ) -> List[SCourseRead]:
-    course_orm = await rep(session).find(course_titles)
+    course_orm = await rep(session).find(course_titles, fields)
+    schema = read_schema(SCourseRead, fields)
     if not course_orm:
         logger.error(f"Ошибка при поиске записи в базе данных")
         raise NotFoundError(detail=f"Курсы с параметрами {course_titles} не найдены")
     return [
-        SCourseRead.model_validate(course, from_attributes=True)
-        for course in course_orm
+        schema.model_validate(course, from_attributes=True) for course in course_orm
     ]
 
 
 async def create_new_courses(
     session: AsyncSession, new_course_data: List[SCourseCreate]
 ) -> List[SCourseRead]:
-    new_courses = await rep(session).create(new_course_data)
+    try:
+        new_courses = await rep(session).create(new_course_data)
+    except IntegrityError:
+        logger.warning("Курс с таким названием уже существует")
+        raise ConflictError(
+            detail="Курс с таким названием уже существует",
+            titles=[c.title for c in new_course_data],
+        )
     if not new_courses:
         logger.error(f"Ошибка при создании курса")
         raise BadRequestError(detail="Ошибка при создании курса")
@@ -71,5 +129,11 @@ async def delete_courses(session: AsyncSession, name: str = None):
     if not courses:
         logger.error(f"Ошибка при удалении записи из базы данных")
         raise NotFoundError(detail=f"Курсы с параметрами {name} не найдены")
+    # каскад уберёт курс из ответов студентов: им нужна новая версия (ETag)
+    # и свежий кэш
+    for student_id in await rep_student(session).touch_by_courses(
+        [course.id for course in courses]
+    ):
+        await student_cache.invalidate(session, student_id)
     for course in courses:
         await session.delete(course)
@@ -1,11 +1,21 @@
 import uuid
 import logging
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, FrozenSet, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.batch import load_many
+from src.core.cache import entity_cache
+from src.core.db import async_session_maker
+from src.core.enums import CountMode, LoaderStrategy
+from src.core.etag import page_etag, version_of
+from src.core.fields import read_schema
+from src.core.filters import ListParams
+from src.core.responses import ndjson_lines
 from src.schemas.student import SStudentCreate, SStudentRead, SStudentUpdate
+from src.schemas.batch import SBatch
+from src.schemas.pagination import SPage
 from src.repositories.course import CourseRepository as rep_courses
-from src.service.courses import delete_courses
 
 from src.exception.client_exception import ValidationError, NotFoundError
 
@@ -14,6 +24,8 @@ from src.repositories.students import StudentRepository as rep_student
 
 logger = logging.getLogger(__name__)
 
+student_cache = entity_cache("student", SStudentRead)
+
 
 async def add_student(
     session: AsyncSession, student_data: SStudentCreate
@@ -24,36 +36,106 @@ async def add_student(
         raise ValidationError(detail="Ошибка при создании студента")
 
     courses_data = await rep_courses(session).update(courses)
-    student.courses = courses_data
 
     session.add(student)
     await session.flush()
-    await session.refresh(student, attribute_names=["courses"])
+    await rep_student(session).set_courses(student, courses_data)
     return SStudentRead.model_validate(student, from_attributes=True)
 
 
 async def find_all_students(
-    session: AsyncSession, skip: int = 0, limit: int = 100, **filter_by
-) -> List[SStudentRead]:
-    student_orm = await rep_student(session).get_all(skip, limit, **filter_by)
+    session: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    strategy: LoaderStrategy = LoaderStrategy.SELECTIN,
+    fields: Optional[FrozenSet[str]] = None,
+    params: Optional[ListParams] = None,
+    count: CountMode = CountMode.NONE,
+    **filter_by,
+) -> SPage[SStudentRead]:
+    student_orm, next_cursor = await rep_student(session).get_all(
+        limit, cursor, strategy, fields, params, **filter_by
+    )
+    schema = read_schema(SStudentRead, fields)
     if not student_orm:
         logger.error(f"Не нашло ни одного студента")
         raise NotFoundError(detail="Студенты не найдены")
 
-    return [
-        SStudentRead.model_validate(student_orm, from_attributes=True)
-        for student_orm in student_orm
-    ]
+    total = await rep_student(session).count(count, params)
+    return SPage[schema](
+        items=[
+            schema.model_validate(student_orm, from_attributes=True)
+            for student_orm in student_orm
+        ],
+        next_cursor=next_cursor,
+        total=total,
+    )
 
 
-async def find_one_with_id(
+async def student_version(
     session: AsyncSession, student_id: uuid.UUID
+) -> Optional[datetime]:
+    return await rep_student(session).get_version(student_id)
+
+
+async def students_page_etag(
+    session: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    params: Optional[ListParams] = None,
+) -> Optional[str]:
+    rows = await rep_student(session).get_page_versions(limit, cursor, params)
+    return page_etag(rows, limit) if rows else None
+
+
+async def export_students(chunk_size: int) -> AsyncIterator[bytes]:
+    async with async_session_maker() as session:
+        async for chunk in rep_student(session).stream_all(chunk_size):
+            yield ndjson_lines(
+                SStudentRead.model_validate(student, from_attributes=True)
+                for student in chunk
+            )
+
+
+async def find_one_with_id(
+    session: AsyncSession,
+    student_id: uuid.UUID,
+    strategy: LoaderStrategy = LoaderStrategy.JOINED,
+    fields: Optional[FrozenSet[str]] = None,
+    version: Optional[datetime] = None,
 ) -> SStudentRead:
-    student_orm = await rep_student(session).get_id(student_id)
+    schema = read_schema(SStudentRead, fields)
+    use_cache = strategy is not LoaderStrategy.NOLOAD
+    if use_cache:
+        cached = await student_cache.get(student_id, version)
+        if cached is not None:
+            return schema.model_validate(cached, from_attributes=True)
+
+    student_orm = await rep_student(session).get_id(student_id, strategy, fields)
     if not student_orm:
         logger.error(f"Студент с id {student_id} не найден")
         raise NotFoundError(detail=f"Студент с id {student_id} не найден")
-    return SStudentRead.model_validate(student_orm, from_attributes=True)
+    result = schema.model_validate(student_orm, from_attributes=True)
+    if use_cache and fields is None:
+        await student_cache.set(session, student_id, result, version_of(student_orm))
+    return result
+
+
+async def find_many_students(
+    session: AsyncSession,
+    ids: List[uuid.UUID],
+    fields: Optional[FrozenSet[str]] = None,
+) -> SBatch[SStudentRead]:
+    schema = read_schema(SStudentRead, fields)
+    found = await load_many(
+        session,
+        ids,
+        student_cache,
+        schema,
+        fields,
+        lambda missing: rep_student(session).get_many(missing, fields=fields),
+    )
+    return SBatch[schema].ordered(ids, found)
 
 
 async def update_student_with_course(
@@ -64,11 +146,12 @@ async def update_student_with_course(
         logger.error(f"Ошибка при обновлении студента")
         raise ValidationError(detail="Ошибка при обновлении студента")
 
-    await rep_courses(session).update(student_data.courses)
-    student.courses = [course.to_orm_model() for course in student_data.courses]
+    if student_data.courses is not None:
+        courses_data = await rep_courses(session).update(student_data.courses)
+        await rep_student(session).set_courses(student, courses_data, replace=True)
 
     await session.flush()
-    await session.refresh(student, attribute_names=["courses"])
+    await student_cache.invalidate(session, student_id)
     return SStudentRead.model_validate(student, from_attributes=True)
 
 
@@ -77,4 +160,5 @@ async def delete_student(session: AsyncSession, **filter_by):
     if not student:
         logger.error(f"Ошибка при удалении записи из базы данных")
         raise NotFoundError(student_id=filter_by)
+    await student_cache.invalidate(session, student.id)
     return f"Студент с id {filter_by} успешно удалён"
@@ -1,10 +1,21 @@
 import uuid
 import logging
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, FrozenSet, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.schemas.user import SUserCreate, SUserRead, SUserUpdate
+from src.core.batch import load_many
+from src.core.cache import entity_cache
+from src.core.db import async_session_maker
+from src.core.enums import CountMode, LoaderStrategy
+from src.core.etag import page_etag, version_of
+from src.core.fields import read_schema
+from src.core.filters import ListParams
+from src.core.responses import ndjson_lines
+from src.schemas.user import SUserCreate, SUserRead, SUserSearchHit, SUserUpdate
+from src.schemas.batch import SBatch
+from src.schemas.pagination import SPage
 
 from src.repositories.user import UserRepository as rep_user
 from src.exception.client_exception import NotFoundError, ValidationError
@@ -12,6 +23,8 @@ from src.exception.client_exception import NotFoundError, ValidationError
 
 logger = logging.getLogger(__name__)
 
+user_cache = entity_cache("user", SUserRead)
+
 
 async def create_user_with_profile(
     session: AsyncSession, user_data: SUserCreate
@@ -28,25 +41,112 @@ async def create_user_with_profile(
 
 
 async def find_one_or_none_with_profile(
-    session: AsyncSession, **filter_by
+    session: AsyncSession,
+    strategy: LoaderStrategy = LoaderStrategy.JOINED,
+    fields: Optional[FrozenSet[str]] = None,
+    version: Optional[datetime] = None,
+    **filter_by,
 ) -> SUserRead:
-    user = await rep_user(session).get_id(**filter_by)
+    schema = read_schema(SUserRead, fields)
+    # кэшируем только поиск по id с профилем
+    cache_id = filter_by.get("id") if filter_by.keys() == {"id"} else None
+    if strategy is LoaderStrategy.NOLOAD:
+        cache_id = None
+    if cache_id is not None:
+        cached = await user_cache.get(cache_id, version)
+        if cached is not None:
+            return schema.model_validate(cached, from_attributes=True)
+
+    user = await rep_user(session).get_id(strategy, fields, **filter_by)
     if not user:
         logger.error(f"Ошибка при поиске записи в базе данных")
         raise NotFoundError(detail=f"Пользователь с id {filter_by} не найден")
-    return SUserRead.model_validate(user, from_attributes=True)
+    result = schema.model_validate(user, from_attributes=True)
+    if cache_id is not None and fields is None:
+        await user_cache.set(session, cache_id, result, version_of(user))
+    return result
+
+
+async def find_many_users(
+    session: AsyncSession,
+    ids: List[uuid.UUID],
+    fields: Optional[FrozenSet[str]] = None,
+) -> SBatch[SUserRead]:
+    schema = read_schema(SUserRead, fields)
+    found = await load_many(
+        session,
+        ids,
+        user_cache,
+        schema,
+        fields,
+        lambda missing: rep_user(session).get_many(missing, fields=fields),
+    )
+    return SBatch[schema].ordered(ids, found)
 
 
 async def find_all_with_profiles(
-    session: AsyncSession, skip: int = 0, limit: int = 100, **filter_by
-) -> List[SUserRead]:
-    users = await rep_user(session).get_all(skip, limit, **filter_by)
+    session: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    strategy: LoaderStrategy = LoaderStrategy.JOINED,
+    fields: Optional[FrozenSet[str]] = None,
+    params: Optional[ListParams] = None,
+    count: CountMode = CountMode.NONE,
+    **filter_by,
+) -> SPage[SUserRead]:
+    users, next_cursor = await rep_user(session).get_all(
+        limit, cursor, strategy, fields, params, **filter_by
+    )
+    schema = read_schema(SUserRead, fields)
     if not users:
         logger.warning(
             f"Пользователи с параметрами {filter_by} не найдены, возвращен пустой список."
         )
         raise NotFoundError(detail=f"Пользователи с параметрами {filter_by} не найдены")
-    return [SUserRead.model_validate(rec, from_attributes=True) for rec in users]
+    total = await rep_user(session).count(count, params)
+    return SPage[schema](
+        items=[schema.model_validate(rec, from_attributes=True) for rec in users],
+        next_cursor=next_cursor,
+        total=total,
+    )
+
+
+async def user_version(session: AsyncSession, user_id: uuid.UUID) -> Optional[datetime]:
+    return await rep_user(session).get_version(user_id)
+
+
+async def users_page_etag(
+    session: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    params: Optional[ListParams] = None,
+) -> Optional[str]:
+    rows = await rep_user(session).get_page_versions(limit, cursor, params)
+    return page_etag(rows, limit) if rows else None
+
+
+async def search_users(
+    session: AsyncSession, text: str, limit: int = 10
+) -> List[SUserSearchHit]:
+    hits = await rep_user(session).search(text, limit)
+    return [
+        SUserSearchHit(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            profile=user.profile,
+            score=score,
+        )
+        for user, score in hits
+    ]
+
+
+async def export_users(chunk_size: int) -> AsyncIterator[bytes]:
+    async with async_session_maker() as session:
+        async for chunk in rep_user(session).stream_all(chunk_size):
+            yield ndjson_lines(
+                SUserRead.model_validate(user, from_attributes=True) for user in chunk
+            )
 
 
 async def update_user(
@@ -59,12 +159,15 @@ async def update_user(
 
     await session.flush()
     await session.refresh(user, ["profile"])
+    await user_cache.invalidate(session, user_id)
     return SUserRead.model_validate(user, from_attributes=True)
 
 
 async def delete_user(session: AsyncSession, user_id: uuid.UUID):
-    user = await rep_user(session).get_id(id=user_id)
+    # профиль удалит ON DELETE CASCADE (passive_deletes), загружать его незачем
+    user = await rep_user(session).get_id(LoaderStrategy.NOLOAD, id=user_id)
     if not user:
         logger.error(f"Ошибка при удалении записи из базы данных")
         raise NotFoundError(detail=f"Пользователь с id {user_id} не найден")
     await session.delete(user)
+    await user_cache.invalidate(session, user_id)